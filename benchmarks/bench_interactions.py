@@ -0,0 +1,225 @@
+# benchmarks/bench_interactions.py
+"""Drive the real cogs with fake Discord objects against a temp SQLite file (or another storage backend).
+
+Covers the points slash commands, the ticket modal -> create_ticket path and the
+join/leave/close ticket buttons. Reports ops/sec and latency percentiles per
+operation, writes them as JSON, and can fail the run against a saved baseline.
+
+Run from the repository root:
+    python -m benchmarks.bench_interactions [--tickets 200] [--rest-ms 0] [--output results.json]
+    python -m benchmarks.bench_interactions --baseline results.json   # exit 1 on regression
+    python -m benchmarks.bench_interactions --storage memory           # isolate cog/view overhead from storage
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "benchmark")
+
+from storage import create_storage
+from benchmarks.fakes import FakeBot, FakeGuild, FakeInteraction, FakeRest
+from modules.points.commands import PointsCog
+from modules.points.points_extra import PointsExtraCog
+from modules.tickets.ticket_commands import TicketCommandsCog
+from modules.tickets.ticket_modal import TicketModal
+from modules.tickets.ticket_views import TicketControl
+
+CATEGORY = "Grim Express"  # 6 helper slots
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+
+    async def measure(self, name, interaction, coro):
+        start = time.perf_counter()
+        loop_start = asyncio.get_running_loop().time()
+        await coro
+        wall = time.perf_counter() - start
+        # Time to the first response is what the 3 s interaction deadline applies to
+        ack = (interaction.responded_at - loop_start) if interaction.responded_at is not None else wall
+        self.samples.setdefault(name, []).append((wall, ack))
+
+    def summary(self, elapsed):
+        results = {}
+        for name, samples in self.samples.items():
+            walls = sorted(wall for wall, _ in samples)
+            acks = sorted(ack for _, ack in samples)
+            results[name] = {
+                "count": len(samples),
+                "ops_per_sec": len(samples) / elapsed[name] if elapsed[name] else None,
+                "p50_ms": _percentile(walls, 50) * 1000,
+                "p95_ms": _percentile(walls, 95) * 1000,
+                "p99_ms": _percentile(walls, 99) * 1000,
+                "max_ms": walls[-1] * 1000,
+                "ack_p99_ms": _percentile(acks, 99) * 1000,
+            }
+        return results
+
+async def _phase(recorder, elapsed, name, jobs, concurrency):
+    """Run (interaction, coroutine factory) jobs with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        interaction, make = job
+        async with semaphore:
+            await recorder.measure(name, interaction, make())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(job) for job in jobs))
+    elapsed[name] = elapsed.get(name, 0) + time.perf_counter() - start
+
+async def run(args):
+    rng = random.Random(args.seed)
+    recorder = Recorder()
+    elapsed = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_storage({"sqlite": f"sqlite:///{os.path.join(tmp, 'bench.db')}", "memory": "memory://"}.get(args.storage, args.storage))
+        await db.initialize_database()
+        bot = FakeBot(db)
+        points_cog = PointsCog(bot)
+        history_cog = PointsExtraCog(bot)
+        ticket_cog = TicketCommandsCog(bot)
+        for cog in (points_cog, history_cog, ticket_cog):
+            await bot.add_cog(cog)
+        ticket_cog.close_pipeline.delete_delay = 0
+
+        guild = FakeGuild(rest=FakeRest(args.rest_ms / 1000))
+        admin = guild.add_member(administrator=True)
+        members = [guild.add_member() for _ in range(args.users)]
+        await db.update_server_config(guild.id, ticket_category_id=guild.ticket_category.id)
+
+        def interaction(user, **kwargs):
+            return FakeInteraction(bot, guild, user, **kwargs)
+
+        # ----- Points slash commands -----
+        jobs = []
+        for member in members:
+            inter = interaction(admin)
+            jobs.append((inter, lambda inter=inter, member=member: points_cog.addpoints.callback(points_cog, inter, member, rng.randint(1, 20))))
+        await _phase(recorder, elapsed, "/addpoints", jobs, args.concurrency)
+
+        for name, make in (
+            ("/points", lambda inter: points_cog.points.callback(points_cog, inter, None)),
+            ("/myrank", lambda inter: points_cog.myrank.callback(points_cog, inter)),
+            ("/myrank week", lambda inter: points_cog.myrank.callback(points_cog, inter, "week")),
+            ("/leaderboard", lambda inter: points_cog.leaderboard.callback(points_cog, inter)),
+            ("/leaderboard week", lambda inter: points_cog.leaderboard.callback(points_cog, inter, "week")),
+            ("/history", lambda inter: history_cog.history_command.callback(history_cog, inter, None)),
+        ):
+            jobs = []
+            for _ in range(args.reads):
+                inter = interaction(rng.choice(members))
+                jobs.append((inter, lambda inter=inter, make=make: make(inter)))
+            await _phase(recorder, elapsed, name, jobs, args.concurrency)
+
+        # ----- Ticket modal -> TicketCommandsCog.create_ticket -----
+        jobs = []
+        for _ in range(args.tickets):
+            inter = interaction(rng.choice(members))
+            modal = TicketModal(CATEGORY, guild.id)
+            for field, value in ((modal.in_game_name, "Hero"), (modal.server_name, "Twilly"), (modal.room_number, "1234")):
+                field._value = value
+            jobs.append((inter, lambda inter=inter, modal=modal: modal.on_submit(inter)))
+        await _phase(recorder, elapsed, "modal:ticket", jobs, args.concurrency)
+
+        tickets = [await ticket_cog.tickets.get(channel_id) for channel_id in list(ticket_cog.tickets._tickets)]
+        channels = {ticket.channel_id: guild.get_channel(ticket.channel_id) for ticket in tickets}
+
+        def button(action, ticket, user):
+            channel = channels[ticket.channel_id]
+            inter = interaction(user, channel=channel, message=channel.messages.get(ticket.message_id))
+            return inter, lambda: TicketControl(action, ticket.channel_id).callback(inter)
+
+        # ----- Ticket buttons -----
+        joined = []
+        jobs = []
+        for ticket in tickets:
+            for helper in rng.sample(members, args.helpers):
+                joined.append((ticket, helper))
+                jobs.append(button("join", ticket, helper))
+        await _phase(recorder, elapsed, "button:ticket-join", jobs, args.concurrency)
+
+        leavers = joined[::2]
+        await _phase(recorder, elapsed, "button:ticket-leave",
+                     [button("leave", ticket, helper) for ticket, helper in leavers], args.concurrency)
+        await ticket_cog.embed_updater.flush()
+
+        await _phase(recorder, elapsed, "button:ticket-close",
+                     [button("close", ticket, admin) for ticket in tickets], args.concurrency)
+        await ticket_cog.close_pipeline.drain()
+        await db.close()
+
+    return {
+        "config": {
+            "users": args.users,
+            "reads": args.reads,
+            "tickets": args.tickets,
+            "helpers": args.helpers,
+            "concurrency": args.concurrency,
+            "rest_ms": args.rest_ms,
+            "storage": args.storage,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "rest_calls": guild.rest.calls,
+        "results": recorder.summary(elapsed),
+    }
+
+def compare(results, baseline, tolerance):
+    """Return the operations whose p95 rose or throughput fell by more than `tolerance`"""
+    regressions = []
+    for name, current in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if before["ops_per_sec"] and current["ops_per_sec"] < before["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {before['ops_per_sec']:.0f} -> {current['ops_per_sec']:.0f} ops/s")
+    return regressions
+
+def print_table(results):
+    print(f"{'operation':<22} {'count':>6} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ack p99':>8}")
+    for name, entry in results["results"].items():
+        print(f"{name:<22} {entry['count']:>6} {entry['ops_per_sec']:>9.0f} {entry['p50_ms']:>8.2f} "
+              f"{entry['p95_ms']:>8.2f} {entry['p99_ms']:>8.2f} {entry['ack_p99_ms']:>8.2f}")
+    print(f"fake REST calls: {results['rest_calls']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=500, help="calls per read-only command")
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--helpers", type=int, default=3, help="helpers joining each ticket")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rest-ms", type=float, default=0.0, help="simulated Discord REST latency")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--storage", default="sqlite", help="sqlite (temp file), memory, or a DATABASE_URL")
+    parser.add_argument("--output", help="write JSON results here")
+    parser.add_argument("--baseline", help="JSON results to compare against; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
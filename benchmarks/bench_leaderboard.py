@@ -0,0 +1,81 @@
+# benchmarks/bench_leaderboard.py
+"""Compare the old sort-everything leaderboard path with LeaderboardIndex.
+
+Run from the repository root:  python -m benchmarks.bench_leaderboard [--users 100000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "benchmark")
+
+from database import DatabaseManager
+from leaderboard import LeaderboardIndex
+
+GUILD_ID = 1
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+async def run(users: int, repeat: int):
+    rng = random.Random(42)
+    rows = [(user_id, rng.randint(0, 5000)) for user_id in range(users)]
+    target = rng.randrange(users)
+
+    # Old path: every /leaderboard and /myrank sorted the whole guild and scanned for the caller
+    all_points = dict(rows)
+    def old_top():
+        return sorted(all_points.items(), key=lambda x: x[1], reverse=True)[:10]
+    def old_rank():
+        for i, (user_id, _) in enumerate(sorted(all_points.items(), key=lambda x: x[1], reverse=True), start=1):
+            if user_id == target:
+                return i
+
+    build_start = time.perf_counter()
+    index = LeaderboardIndex(rows)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    def award():
+        index.add(rng.randrange(users), rng.randint(1, 12))
+
+    print(f"{users} users in one guild")
+    print(f"  index build:              {build_ms:9.2f} ms")
+    print(f"  top 10   sort-all:        {timeit(old_top, repeat):9.3f} ms")
+    print(f"  top 10   index:           {timeit(lambda: index.top(10), repeat * 100):9.4f} ms")
+    print(f"  rank     sort+scan:       {timeit(old_rank, repeat):9.3f} ms")
+    print(f"  rank     index:           {timeit(lambda: index.rank(target), repeat * 100):9.4f} ms")
+    print(f"  award    index update:    {timeit(award, repeat * 100):9.4f} ms")
+
+    # Lazy hydration cost through DatabaseManager on a temp SQLite file
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        await db.initialize_database()
+        async with db._write() as conn:
+            await conn.executemany("INSERT INTO user_points (guild_id, user_id, points) VALUES (?, ?, ?)",
+                                   [(GUILD_ID, user_id, points) for user_id, points in rows])
+        start = time.perf_counter()
+        await db.get_top_points(GUILD_ID, 10)
+        hydrate_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for _ in range(repeat * 100):
+            await db.get_user_rank(GUILD_ID, target)
+        cached_ms = (time.perf_counter() - start) / (repeat * 100) * 1000
+        await db.close()
+    print(f"  first access (hydrate):   {hydrate_ms:9.2f} ms")
+    print(f"  get_user_rank (hydrated): {cached_ms:9.4f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/check_query_plans.py
+"""Fail if a hot DatabaseManager query plans a full table scan.
+
+Every DatabaseManager method is driven once against a temp SQLite file with the
+query profiler on; each statement it issued is run through EXPLAIN QUERY PLAN.
+Statements issued by the HOT methods must only SEARCH; a SCAN there exits 1.
+Cold statements (startup loads, snapshots) are listed for information.
+
+Run from the repository root:  python -m benchmarks.check_query_plans [--verbose]
+tests/test_query_plans.py runs the same check under pytest.
+"""
+import argparse
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "benchmark")
+
+from database import DatabaseManager
+
+GUILD_ID = 1
+USER_ID = 10
+CHANNEL_ID = 100
+TICKET_TYPE = "Grim Express"
+
+async def _seed(db):
+    await db.update_server_config(GUILD_ID, ticket_category_id=5)
+    await db.set_point_values(GUILD_ID, {TICKET_TYPE: 10})
+    await db.set_helper_slots(GUILD_ID, {TICKET_TYPE: 6})
+    await db.set_custom_command(GUILD_ID, "hello", "Hello!")
+    for user_id in range(USER_ID, USER_ID + 50):
+        await db.add_user_points(GUILD_ID, user_id, user_id)
+    for offset in range(20):
+        channel_id = CHANNEL_ID + offset
+        await db.save_active_ticket(GUILD_ID, channel_id, USER_ID, TICKET_TYPE, offset + 1, message_id=channel_id)
+        await db.add_ticket_helper(channel_id, USER_ID + offset)
+    await db.flush_points()
+
+# (method, args, kwargs); each runs on a fresh DatabaseManager so in-memory caches cannot hide a query
+HOT = [
+    ("get_user_points", (GUILD_ID, USER_ID), {}),
+    ("get_all_user_points", (GUILD_ID,), {}),
+    ("get_next_ticket_number", (GUILD_ID, TICKET_TYPE), {}),
+    ("remove_active_ticket", (GUILD_ID, CHANNEL_ID), {}),
+    ("close_ticket", (GUILD_ID, CHANNEL_ID + 1, [USER_ID, USER_ID + 1], 10), {}),
+    ("get_active_ticket", (CHANNEL_ID + 2,), {}),
+    ("add_ticket_helper", (CHANNEL_ID + 2, USER_ID + 40), {}),
+    ("remove_ticket_helper", (CHANNEL_ID + 2, USER_ID + 40), {}),
+    ("save_active_ticket", (GUILD_ID, CHANNEL_ID + 500, USER_ID, TICKET_TYPE, 500), {}),
+    ("add_points_bulk", (GUILD_ID, [USER_ID, USER_ID + 1], 3), {}),
+    ("get_server_config", (GUILD_ID,), {}),
+    ("get_top_points", (GUILD_ID, 10), {"window": "week"}),
+    ("get_user_rank", (GUILD_ID, USER_ID), {"window": "week"}),
+    ("get_user_rank", (GUILD_ID, USER_ID), {}),
+    ("get_points_history", (GUILD_ID, USER_ID), {}),
+    ("get_helper_tickets", (GUILD_ID, USER_ID), {}),
+]
+
+COLD = [
+    ("get_active_tickets", (), {}),
+    ("get_point_values", (GUILD_ID,), {}),
+    ("get_helper_slots", (GUILD_ID,), {}),
+    ("get_custom_command", (GUILD_ID, "hello"), {}),
+    ("set_user_points", (GUILD_ID, USER_ID, 7), {}),
+    ("remove_user", (GUILD_ID, USER_ID + 2), {}),
+    ("replay_points", (GUILD_ID,), {}),
+    ("snapshot_points", (), {}),
+    ("clear_all_points", (GUILD_ID,), {}),
+]
+
+async def _statements(path, method, args, kwargs):
+    db = DatabaseManager(path)
+    profiler = db.enable_profiling()
+    try:
+        result = await getattr(db, method)(*args, **kwargs)
+        # Buffered writes reach SQLite on flush; attribute that flush to the method that buffered them
+        await db.flush_points()
+    finally:
+        await db.close()
+    return profiler.statements(), result
+
+def _plan(conn, sql):
+    numbered = [int(index) for index in re.findall(r"\?(\d+)", sql)]
+    params = (None,) * (max(numbered) if numbered else sql.count("?"))
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+def _is_full_scan(detail):
+    # "SCAN (subquery-N)" walks an already-filtered intermediate result, not a table
+    return detail.startswith("SCAN ") and not detail.startswith("SCAN (") and detail != "SCAN CONSTANT ROW"
+
+async def collect_plans():
+    """[(hot, method, sql, plan details)] for every statement the HOT and COLD methods issue"""
+    plans = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "plans.db")
+        db = DatabaseManager(path)
+        await db.initialize_database()
+        await _seed(db)
+        await db.close()
+
+        conn = sqlite3.connect(path)
+        try:
+            for hot, cases in ((True, HOT), (False, COLD)):
+                for method, args, kwargs in cases:
+                    statements, _ = await _statements(path, method, args, kwargs)
+                    for sql in statements:
+                        plans.append((hot, method, sql, _plan(conn, sql)))
+        finally:
+            conn.close()
+    return plans
+
+def full_scans(plans):
+    """[(method, sql, scans)] of the hot statements that scan a whole table"""
+    failures = []
+    for hot, method, sql, plan in plans:
+        scans = [detail for detail in plan if _is_full_scan(detail)]
+        if hot and scans:
+            failures.append((method, sql, scans))
+    return failures
+
+async def run(verbose: bool):
+    plans = await collect_plans()
+    failures = full_scans(plans)
+    failed = {(method, sql) for method, sql, _ in failures}
+    for hot, method, sql, plan in plans:
+        if (method, sql) in failed:
+            status = "FAIL"
+        else:
+            status = "scan" if any(_is_full_scan(detail) for detail in plan) else "ok"
+        if verbose or status != "ok":
+            print(f"[{status:>4}] {'hot ' if hot else 'cold'} {method}: {sql}")
+            for detail in plan:
+                print(f"         {detail}")
+
+    if failures:
+        print(f"\n{len(failures)} hot statement(s) do a full table scan:")
+        for method, sql, scans in failures:
+            print(f"  {method}: {'; '.join(scans)}\n    {sql}")
+        return 1
+    print("No full table scans in hot queries.")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="print the plan of every statement")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.verbose)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# benchmarks/fakes.py
+"""Just enough of discord.py's Interaction/Guild/Member/TextChannel surface to drive the cogs offline.
+
+Every call that would be a REST round trip awaits the guild's FakeRest, so runs can model Discord latency.
+"""
+import asyncio
+import itertools
+from types import SimpleNamespace
+import discord
+
+_ids = itertools.count(10_000)
+
+def next_id():
+    return next(_ids)
+
+class FakeRest:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        else:
+            await asyncio.sleep(0)  # still yield, as a real request would
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str = "role"):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+class FakeMember:
+    def __init__(self, guild, user_id: int = None, name: str = None, administrator: bool = False, roles=()):
+        self.guild = guild
+        self.id = user_id or next_id()
+        self.name = name or f"user{self.id}"
+        self.display_name = self.name
+        self.mention = f"<@{self.id}>"
+        self.bot = False
+        self.roles = list(roles)
+        self.guild_permissions = SimpleNamespace(administrator=administrator)
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embed=None, view=None, author=None):
+        self.id = next_id()
+        self.channel = channel
+        self.content = content or ""
+        self.embeds = [embed] if embed is not None else []
+        self.view = view
+        self.author = author
+        self.attachments = []
+        self.created_at = discord.utils.utcnow()
+
+    async def edit(self, embed=None, **kwargs):
+        await self.channel.rest()
+        if embed is not None:
+            self.embeds = [embed]
+
+class FakePartialMessage:
+    def __init__(self, channel, message_id: int):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, embed=None, **kwargs):
+        message = self.channel.messages.get(self.id)
+        if message is None:
+            await self.channel.rest()
+            return
+        await message.edit(embed=embed, **kwargs)
+
+class FakeTextChannel:
+    def __init__(self, guild, name: str, category=None, overwrites=None):
+        self.guild = guild
+        self.id = next_id()
+        self.name = name
+        self.category = category
+        self.mention = f"<#{self.id}>"
+        self.overwrites = dict(overwrites or {})
+        self.messages = {}
+        self.deleted = False
+        self.rest = guild.rest
+
+    async def send(self, content=None, embed=None, view=None, file=None, **kwargs):
+        await self.rest()
+        message = FakeMessage(self, content, embed, view, author=self.guild.me)
+        self.messages[message.id] = message
+        return message
+
+    async def set_permissions(self, target, overwrite=None, **permissions):
+        await self.rest()
+        self.overwrites[target] = permissions or overwrite
+
+    async def fetch_message(self, message_id: int):
+        await self.rest()
+        return self.messages[message_id]
+
+    def get_partial_message(self, message_id: int):
+        return FakePartialMessage(self, message_id)
+
+    async def history(self, limit=None, oldest_first=False):
+        await self.rest()
+        for message in list(self.messages.values()):
+            yield message
+
+    async def delete(self, reason=None):
+        await self.rest()
+        self.deleted = True
+        self.guild.channels.pop(self.id, None)
+
+class FakeGuild:
+    def __init__(self, guild_id: int = None, rest: FakeRest = None):
+        self.id = guild_id or next_id()
+        self.rest = rest or FakeRest()
+        self.name = f"guild{self.id}"
+        self.filesize_limit = 25 * 1024 * 1024
+        self.channels = {}
+        self.members = {}
+        self.roles = {}
+        self.default_role = self.add_role("@everyone")
+        self.me = self.add_member(name="bot")
+        category = FakeTextChannel(self, "tickets")
+        self.channels[category.id] = category
+        self.ticket_category = category
+
+    def add_role(self, name: str):
+        role = FakeRole(next_id(), name)
+        self.roles[role.id] = role
+        return role
+
+    def add_member(self, **kwargs):
+        member = FakeMember(self, **kwargs)
+        self.members[member.id] = member
+        return member
+
+    def get_member(self, user_id: int):
+        return self.members.get(user_id)
+
+    async def fetch_member(self, user_id: int):
+        await self.rest()
+        member = self.members.get(user_id)
+        if member is None:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Member")
+        return member
+
+    def get_role(self, role_id: int):
+        return self.roles.get(role_id)
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    async def create_text_channel(self, name, category=None, overwrites=None, reason=None):
+        await self.rest()
+        channel = FakeTextChannel(self, name, category, overwrites)
+        self.channels[channel.id] = channel
+        return channel
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def _respond(self):
+        if self._done:
+            raise RuntimeError("interaction already responded to")
+        await self._interaction.guild.rest()
+        self._done = True
+        self._interaction.responded_at = asyncio.get_running_loop().time()
+
+    async def send_message(self, content=None, embed=None, view=None, ephemeral=False, **kwargs):
+        await self._respond()
+        self._interaction.sent.append((content, embed, view))
+
+    async def defer(self, ephemeral=False, thinking=False):
+        await self._respond()
+
+    async def edit_message(self, content=None, embed=None, view=None, **kwargs):
+        await self._respond()
+        self._interaction.sent.append((content, embed, view))
+
+    async def send_modal(self, modal):
+        await self._respond()
+        self._interaction.sent.append((None, None, modal))
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send(self, content=None, embed=None, view=None, ephemeral=False, **kwargs):
+        await self._interaction.guild.rest()
+        self._interaction.sent.append((content, embed, view))
+
+class FakeInteraction:
+    def __init__(self, client, guild: FakeGuild, user: FakeMember, channel=None, message=None):
+        self.client = client
+        self.guild = guild
+        self.user = user
+        self.channel = channel
+        self.message = message
+        self.id = next_id()
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.sent = []
+        self.created_at = asyncio.get_running_loop().time()
+        self.responded_at = None
+
+class FakeBot:
+    """Stands in for TicketBot: a db, cogs by name, and a latency"""
+
+    def __init__(self, db):
+        self.db = db
+        self.latency = 0.05
+        self.cogs = {}
+
+    def get_cog(self, name: str):
+        return self.cogs.get(name)
+
+    def add_dynamic_items(self, *items):
+        pass
+
+    def remove_dynamic_items(self, *items):
+        pass
+
+    async def add_cog(self, cog):
+        self.cogs[type(cog).__name__] = cog
+        if hasattr(cog, "cog_load"):
+            await cog.cog_load()
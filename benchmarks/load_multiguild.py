@@ -0,0 +1,166 @@
+# benchmarks/load_multiguild.py
+"""Simulate many guilds creating, joining and closing tickets at the same moment.
+
+Each worker process owns a slice of the guilds and its own DatabaseManager on one
+shared SQLite file, like several bot processes on one host. For every guild,
+--tickets flows (create -> helpers join -> close) start together. The run
+reports per-operation tail latency, BEGIN retries, "database is locked" errors
+and any other failures, for each storage configuration side by side.
+
+Run from the repository root:
+    python -m benchmarks.load_multiguild [--guilds 50] [--tickets 10] [--processes 4]
+    python -m benchmarks.load_multiguild --configs wal,delete-journal --max-lock-errors 0   # CI gate
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DISCORD_BOT_TOKEN", "benchmark")
+
+from database import DatabaseManager, PRAGMAS, _is_lock_error
+
+def _replace(pragmas, name, value):
+    return tuple(f"PRAGMA {name} = {value}" if pragma.startswith(f"PRAGMA {name} ") else pragma for pragma in pragmas)
+
+# Storage configurations to compare: name -> PRAGMAs applied to every connection
+CONFIGS = {
+    "wal": PRAGMAS,
+    "wal-sync-full": _replace(PRAGMAS, "synchronous", "FULL"),
+    "wal-no-busy-timeout": _replace(PRAGMAS, "busy_timeout", "0"),
+    "delete-journal": _replace(PRAGMAS, "journal_mode", "DELETE"),
+}
+
+OPERATIONS = ("create", "join", "close")
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))] if ordered else 0.0
+
+async def _worker_main(path, pragmas, guild_ids, tickets, helpers, barrier):
+    db = DatabaseManager(path, pragmas=pragmas)
+    await db.connect()
+    samples = {op: [] for op in OPERATIONS}
+    errors = {}
+
+    async def timed(op, coro):
+        start = time.perf_counter()
+        try:
+            await coro
+            return True
+        except sqlite3.OperationalError as e:
+            key = "lock" if _is_lock_error(e) else f"{type(e).__name__}: {e}"
+            errors[key] = errors.get(key, 0) + 1
+            return False
+        except Exception as e:
+            key = f"{type(e).__name__}: {e}"
+            errors[key] = errors.get(key, 0) + 1
+            return False
+        finally:
+            samples[op].append(time.perf_counter() - start)
+
+    async def create(guild_id, channel_id):
+        number = await db.get_next_ticket_number(guild_id, "Grim Express")
+        await db.save_active_ticket(guild_id, channel_id, channel_id + 1, "Grim Express", number, message_id=channel_id)
+
+    async def flow(guild_id, n):
+        channel_id = guild_id * 1_000_000 + n * 100
+        if not await timed("create", create(guild_id, channel_id)):
+            return
+        helper_ids = [channel_id + 10 + h for h in range(helpers)]
+        await asyncio.gather(*(timed("join", db.add_ticket_helper(channel_id, user_id)) for user_id in helper_ids))
+        await timed("close", db.close_ticket(guild_id, channel_id, helper_ids, 10))
+
+    # Every process starts its burst at the same moment
+    await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+    start = time.perf_counter()
+    await asyncio.gather(*(flow(guild_id, n) for guild_id in guild_ids for n in range(tickets)))
+    elapsed = time.perf_counter() - start
+    await db.close()
+    return {
+        "samples": samples,
+        "errors": errors,
+        "retries": db.lock_retry_count,
+        "elapsed": elapsed,
+    }
+
+def _worker(path, pragmas, guild_ids, tickets, helpers, barrier, results):
+    results.put(asyncio.run(_worker_main(path, pragmas, guild_ids, tickets, helpers, barrier)))
+
+def run_config(name, pragmas, args):
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load.db")
+
+        async def init():
+            db = DatabaseManager(path, pragmas=pragmas)
+            await db.initialize_database()
+            await db.close()
+        asyncio.run(init())
+
+        guild_ids = list(range(1, args.guilds + 1))
+        slices = [guild_ids[i::args.processes] for i in range(args.processes)]
+        barrier = ctx.Barrier(len(slices))
+        results = ctx.Queue()
+        workers = [ctx.Process(target=_worker, args=(path, pragmas, guilds, args.tickets, args.helpers, barrier, results))
+                   for guilds in slices]
+        for worker in workers:
+            worker.start()
+        outputs = [results.get(timeout=args.timeout) for _ in workers]
+        for worker in workers:
+            worker.join()
+
+    summary = {"config": name, "operations": {}, "errors": {}, "retries": 0}
+    elapsed = max(output["elapsed"] for output in outputs)
+    for output in outputs:
+        summary["retries"] += output["retries"]
+        for key, count in output["errors"].items():
+            summary["errors"][key] = summary["errors"].get(key, 0) + count
+    for op in OPERATIONS:
+        ordered = sorted(sample for output in outputs for sample in output["samples"][op])
+        summary["operations"][op] = {
+            "count": len(ordered),
+            "ops_per_sec": len(ordered) / elapsed if elapsed else None,
+            "p50_ms": _percentile(ordered, 50) * 1000,
+            "p99_ms": _percentile(ordered, 99) * 1000,
+            "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+        }
+    summary["lock_errors"] = summary["errors"].get("lock", 0)
+    summary["elapsed_s"] = elapsed
+    return summary
+
+def print_table(summaries):
+    print(f"{'config':<22} {'op':<6} {'count':>6} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>9} {'max ms':>9}")
+    for summary in summaries:
+        for op, entry in summary["operations"].items():
+            print(f"{summary['config']:<22} {op:<6} {entry['count']:>6} {entry['ops_per_sec']:>8.0f} "
+                  f"{entry['p50_ms']:>8.2f} {entry['p99_ms']:>9.2f} {entry['max_ms']:>9.2f}")
+        other = {key: count for key, count in summary["errors"].items() if key != "lock"}
+        print(f"{'':<22} lock errors: {summary['lock_errors']}  BEGIN retries: {summary['retries']}  other errors: {other or 0}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=10, help="concurrent ticket flows per guild")
+    parser.add_argument("--helpers", type=int, default=3)
+    parser.add_argument("--processes", type=int, default=4, help="bot processes sharing the SQLite file")
+    parser.add_argument("--configs", default=",".join(CONFIGS), help=f"comma-separated, from: {', '.join(CONFIGS)}")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--output", help="write JSON results here")
+    parser.add_argument("--max-lock-errors", type=int, help="exit 1 if any configuration sees more lock errors")
+    args = parser.parse_args()
+
+    summaries = [run_config(name, CONFIGS[name], args) for name in args.configs.split(",")]
+    print_table(summaries)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": summaries}, f, indent=2)
+    if args.max_lock_errors is not None and any(s["lock_errors"] > args.max_lock_errors for s in summaries):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# cluster.py
+"""Run the bot's shards across several worker processes under a supervisor.
+
+Each worker is a full TicketBot for a contiguous block of shards, with its own
+event loop, caches and webserver (port base_port + cluster id; /shards reports
+its shards). Guild state is keyed by guild and a guild maps to exactly one shard,
+so workers share nothing but the database file. The supervisor restarts a worker
+that exits, with backoff, and logs shards that are not ready.
+
+    python cluster.py --clusters 2 --shards 4
+    python cluster.py --clusters 2 --shards 4 --stub-gateway   # local, no Discord connection
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+import aiohttp
+
+logger = logging.getLogger("cluster")
+
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+RESTART_DELAY = 5.0
+MAX_RESTART_DELAY = 300.0
+STABLE_UPTIME = 60.0  # a worker that ran this long restarts without backoff
+HEALTH_INTERVAL = 15.0
+
+def plan_clusters(shard_count: int, cluster_count: int) -> list:
+    """Split shards 0..shard_count-1 into contiguous, near-equal blocks"""
+    cluster_count = min(cluster_count, shard_count)
+    size, extra = divmod(shard_count, cluster_count)
+    blocks, start = [], 0
+    for cluster_id in range(cluster_count):
+        end = start + size + (1 if cluster_id < extra else 0)
+        blocks.append(list(range(start, end)))
+        start = end
+    return blocks
+
+async def recommended_shards(token: str) -> int:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_BOT_URL, headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            return (await response.json())["shards"]
+
+def _run_worker(cluster_id, shard_ids, shard_count, port, stub_gateway):
+    logging.basicConfig(level=logging.INFO, format=f"[cluster {cluster_id}] %(levelname)s:%(name)s:%(message)s")
+    from main import run_bot
+    asyncio.run(run_bot(shard_ids, shard_count, port, stub_gateway))
+
+class Worker:
+    def __init__(self, cluster_id: int, shard_ids: list, port: int):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.port = port
+        self.process = None
+        self.started_at = 0.0
+        self.restart_delay = RESTART_DELAY
+        self.restart_at = None
+        self.not_ready = None
+
+class Supervisor:
+    def __init__(self, shard_count: int, cluster_count: int, base_port: int = 5000, stub_gateway: bool = False,
+                 host: str = "127.0.0.1", health_interval: float = HEALTH_INTERVAL):
+        self.shard_count = shard_count
+        self.stub_gateway = stub_gateway
+        self.host = host
+        self.health_interval = health_interval
+        self.workers = [Worker(cluster_id, shard_ids, base_port + cluster_id)
+                        for cluster_id, shard_ids in enumerate(plan_clusters(shard_count, cluster_count))]
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop = asyncio.Event()
+
+    def spawn(self, worker: Worker):
+        worker.process = self._ctx.Process(
+            target=_run_worker, name=f"cluster-{worker.cluster_id}",
+            args=(worker.cluster_id, worker.shard_ids, self.shard_count, worker.port, self.stub_gateway))
+        worker.process.start()
+        worker.started_at = time.monotonic()
+        worker.restart_at = None
+        logger.info(f"🚀 Cluster {worker.cluster_id} (pid {worker.process.pid}) started: shards {worker.shard_ids}, port {worker.port}")
+
+    def check_processes(self):
+        now = time.monotonic()
+        for worker in self.workers:
+            if worker.restart_at is not None:
+                if now >= worker.restart_at:
+                    self.spawn(worker)
+                continue
+            if worker.process.is_alive():
+                continue
+            if now - worker.started_at >= STABLE_UPTIME:
+                worker.restart_delay = RESTART_DELAY
+            logger.error(f"❌ Cluster {worker.cluster_id} exited with code {worker.process.exitcode}; "
+                         f"restarting in {worker.restart_delay:.0f}s")
+            worker.restart_at = now + worker.restart_delay
+            worker.restart_delay = min(worker.restart_delay * 2, MAX_RESTART_DELAY)
+
+    async def check_health(self, session):
+        for worker in self.workers:
+            if worker.restart_at is not None:
+                continue
+            try:
+                async with session.get(f"http://{self.host}:{worker.port}/shards") as response:
+                    shards = (await response.json())["shards"]
+                    not_ready = sorted(int(shard_id) for shard_id, entry in shards.items() if entry["state"] != "ready")
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError):
+                not_ready = worker.shard_ids
+            if not_ready != worker.not_ready:
+                if not_ready:
+                    logger.warning(f"⚠️ Cluster {worker.cluster_id}: shards {not_ready} not ready")
+                else:
+                    logger.info(f"✅ Cluster {worker.cluster_id}: all shards ready")
+                worker.not_ready = not_ready
+
+    def status(self) -> dict:
+        return {
+            worker.cluster_id: {
+                "pid": worker.process.pid if worker.process else None,
+                "alive": bool(worker.process and worker.process.is_alive()),
+                "shards": worker.shard_ids,
+                "not_ready": worker.not_ready,
+                "port": worker.port,
+            }
+            for worker in self.workers
+        }
+
+    def stop(self):
+        self._stop.set()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+        for worker in self.workers:
+            self.spawn(worker)
+        last_health = time.monotonic()
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), 1.0)
+                except asyncio.TimeoutError:
+                    pass
+                self.check_processes()
+                if time.monotonic() - last_health >= self.health_interval:
+                    last_health = time.monotonic()
+                    await self.check_health(session)
+        await self.shutdown()
+
+    async def shutdown(self, timeout: float = 30.0):
+        """SIGTERM every worker so it flushes and closes, then kill stragglers"""
+        logger.info("🛑 Stopping clusters")
+        alive = [worker.process for worker in self.workers if worker.process and worker.process.is_alive()]
+        for process in alive:
+            process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in alive:
+            await asyncio.to_thread(process.join, max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"⚠️ {process.name} did not stop in time; killing it")
+                process.kill()
+                process.join()
+
+async def main():
+    from config import TOKEN, SHARD_COUNT
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=2, help="worker processes")
+    parser.add_argument("--shards", type=int, default=SHARD_COUNT, help="total shards (default: Discord's recommendation)")
+    parser.add_argument("--base-port", type=int, default=5000, help="cluster N serves HTTP on base-port + N")
+    parser.add_argument("--stub-gateway", action="store_true", help="do not connect to Discord")
+    parser.add_argument("--health-interval", type=float, default=HEALTH_INTERVAL)
+    args = parser.parse_args()
+
+    shard_count = args.shards
+    if shard_count is None:
+        shard_count = args.clusters if args.stub_gateway else await recommended_shards(TOKEN)
+        logger.info(f"Using {shard_count} shards")
+    supervisor = Supervisor(shard_count, args.clusters, args.base_port, args.stub_gateway,
+                            health_interval=args.health_interval)
+    await supervisor.run()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -10,3 +10,9 @@ if not TOKEN:
 
 PREFIX = "!"
 DB_PATH = os.getenv("DB_PATH", "ticket_bot.db")
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}")  # sqlite:///file.db, memory:// or postgresql://...
+TRANSCRIPT_COMPRESS = os.getenv("TRANSCRIPT_COMPRESS", "0") == "1"  # gzip ticket transcripts
+DB_PROFILE = os.getenv("DB_PROFILE", "0") == "1"  # record per-statement timings (see /dbprofile)
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None  # None: ask Discord for the recommended count
+STUB_GATEWAY = os.getenv("STUB_GATEWAY", "0") == "1"  # run without connecting to Discord (see sharding.StubGateway)
+DEV_GUILD_ID = int(os.getenv("DEV_GUILD_ID", "0")) or None  # sync slash commands to this guild only (instant, for development)
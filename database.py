@@ -1,92 +1,228 @@
-# database.py
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import sqlite3
 import aiosqlite
 from config import DB_PATH
+from leaderboard import LeaderboardIndex
+from migrations import migrate
+from metrics import time_methods
+from query_profiler import QueryProfiler, ProfiledConnection
+from storage import Storage, current_bucket, group_ticket_rows, rollup_rows
 
-class DatabaseManager:
-    def __init__(self, db_path=DB_PATH):
+# Applied to every pooled connection when it is opened
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",     # ~16 MB page cache per connection
+    "PRAGMA mmap_size = 268435456",   # 256 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+def _is_lock_error(error):
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in str(error) or "busy" in str(error))
+
+class DatabaseManager(Storage):
+    """SQLite backend: one writer connection, a reader pool, and write-behind point awards"""
+
+    supports_profiling = True
+
+    def __init__(self, db_path=DB_PATH, pool_size=4, cached_statements=256, flush_interval=0.5, flush_threshold=256,
+                 config_cache_size=1024, snapshot_interval=10000, snapshot_batch=1000, pragmas=PRAGMAS, lock_retries=3):
         self.db_path = db_path
+        self.pragmas = pragmas
+        self.pool_size = pool_size
+        self.cached_statements = cached_statements
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._writer = None
+        self._readers = None
+        self._write_lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
+        # Another process holding the write lock past busy_timeout: BEGIN is retried this many times
+        self.lock_retries = lock_retries
+        self.lock_retry_count = 0
+        self.lock_error_count = 0
+        # Write-behind point buffer: (guild_id, user_id) -> delta not yet in user_points
+        self._pending_points = {}
+        self._flushing_points = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+        # points_ledger rows for the buffered deltas, written in the same transaction as the totals
+        self._pending_events = []
+        self._flushing_events = []
+        # Ledger rows written since the last snapshot; replay reads at most this many past it
+        self.snapshot_interval = snapshot_interval
+        self._ledger_since_snapshot = 0
+        self._snapshot_task = None
+        self._snapshot_lock = asyncio.Lock()
+        # Rows per write transaction while copying a snapshot
+        self.snapshot_batch = snapshot_batch
+        # guild_id -> LeaderboardIndex, hydrated on first leaderboard access
+        self._leaderboards = {}
+        # LRU read-through cache of server_config rows (None = guild has no row)
+        self.config_cache_size = config_cache_size
+        self.config_cache_hits = 0
+        self.config_cache_misses = 0
+        self._config_cache = OrderedDict()
+        self._config_generation = 0
+        # (guild_id, ticket_type) -> last ticket number handed out
+        self._ticket_sequences = {}
+        self._sequence_lock = asyncio.Lock()
+        # QueryProfiler while profiling is enabled, else None
+        self.profiler = None
+
+    # ===================== Connection Pool =====================
+    async def _open(self, read_only=False):
+        # isolation_level=None: transactions are managed explicitly in _write()
+        conn = await aiosqlite.connect(self.db_path, isolation_level=None, cached_statements=self.cached_statements)
+        conn.row_factory = aiosqlite.Row
+        for pragma in self.pragmas:
+            await conn.execute(pragma)
+        if read_only:
+            await conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    async def connect(self):
+        """Open the shared writer connection and the reader pool (idempotent)"""
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            writer = await self._open()
+            readers = asyncio.Queue()
+            for _ in range(self.pool_size):
+                readers.put_nowait(await self._open(read_only=True))
+            self._writer, self._readers = writer, readers
+
+    async def close(self):
+        """Flush buffered writes, then close every pooled connection"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._writer is not None:
+            await self.flush_points()
+        if self._snapshot_task is not None:
+            await self._snapshot_task
+        async with self._connect_lock:
+            if self._writer is None:
+                return
+            async with self._write_lock:
+                await self._writer.close()
+            while not self._readers.empty():
+                await self._readers.get_nowait().close()
+            self._writer, self._readers = None, None
+
+    @asynccontextmanager
+    async def _read(self):
+        if self._writer is None:
+            await self.connect()
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def _write(self):
+        """Run the block as one transaction on the single writer connection"""
+        if self._writer is None:
+            await self.connect()
+        async with self._write_lock:
+            conn = self._writer
+            await self._begin(conn)
+            try:
+                yield conn if self.profiler is None else ProfiledConnection(conn, self.profiler)
+            except BaseException:
+                await conn.execute("ROLLBACK")
+                raise
+            await conn.execute("COMMIT")
+
+    async def _begin(self, conn):
+        # Nothing has run yet when BEGIN fails, so retrying it is always safe
+        for attempt in range(self.lock_retries + 1):
+            try:
+                await conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if not _is_lock_error(e) or attempt == self.lock_retries:
+                    if _is_lock_error(e):
+                        self.lock_error_count += 1
+                    raise
+                self.lock_retry_count += 1
+                await asyncio.sleep(0.05 * 2 ** attempt)
+
+    async def ping(self):
+        """Round-trip a trivial query through the reader pool"""
+        await self._fetchone('SELECT 1')
+
+    async def _fetchone(self, sql, params=()):
+        async with self._read() as conn:
+            start = time.perf_counter()
+            async with conn.execute(sql, params) as cursor:
+                row = await cursor.fetchone()
+            if self.profiler is not None:
+                self.profiler.record(sql, time.perf_counter() - start, row is not None)
+            return row
+
+    async def _fetchall(self, sql, params=()):
+        async with self._read() as conn:
+            start = time.perf_counter()
+            async with conn.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+            if self.profiler is not None:
+                self.profiler.record(sql, time.perf_counter() - start, len(rows))
+            return rows
+
+    # ===================== Query Profiling =====================
+    def enable_profiling(self, sample_size: int = 2048):
+        """Start recording every statement; returns the QueryProfiler (dump() it on demand)"""
+        if self.profiler is None:
+            self.profiler = QueryProfiler(sample_size)
+        return self.profiler
 
     async def initialize_database(self):
-        async with aiosqlite.connect(self.db_path) as db:
-            # server_config table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS server_config (
-                    guild_id INTEGER PRIMARY KEY,
-                    admin_role_id INTEGER,
-                    staff_role_id INTEGER,
-                    helper_role_id INTEGER,
-                    viewer_role_id INTEGER,
-                    blocked_role_id INTEGER,
-                    reward_role_id INTEGER,
-                    ticket_category_id INTEGER,
-                    transcript_channel_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            # point_values table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS point_values (
-                    guild_id INTEGER,
-                    ticket_type TEXT,
-                    points INTEGER,
-                    PRIMARY KEY (guild_id, ticket_type)
-                )
-            ''')
-            # helper_slots table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS helper_slots (
-                    guild_id INTEGER,
-                    ticket_type TEXT,
-                    slots INTEGER,
-                    PRIMARY KEY (guild_id, ticket_type)
-                )
-            ''')
-            # custom_commands table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS custom_commands (
-                    guild_id INTEGER,
-                    command_name TEXT,
-                    content TEXT NOT NULL,
-                    image_url TEXT,
-                    PRIMARY KEY (guild_id, command_name)
-                )
-            ''')
-            # user_points table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS user_points (
-                    guild_id INTEGER,
-                    user_id INTEGER,
-                    points INTEGER DEFAULT 0,
-                    PRIMARY KEY (guild_id, user_id)
-                )
-            ''')
-            # active_tickets table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS active_tickets (
-                    guild_id INTEGER,
-                    channel_id INTEGER PRIMARY KEY,
-                    creator_id INTEGER,
-                    ticket_type TEXT,
-                    ticket_number INTEGER,
-                    helpers TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            await db.commit()
+        """Apply pending migrations in one transaction, so a failed one leaves the database untouched; returns (version before, version after)"""
+        async with self._write() as db:
+            return await migrate(db)
 
     # ===================== Server Config =====================
     async def get_server_config(self, guild_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT * FROM server_config WHERE guild_id = ?', (guild_id,)) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    columns = [description[0] for description in cursor.description]
-                    return dict(zip(columns, row))
-                return None
+        if guild_id in self._config_cache:
+            self._config_cache.move_to_end(guild_id)
+            self.config_cache_hits += 1
+            config = self._config_cache[guild_id]
+            return dict(config) if config else None
+        self.config_cache_misses += 1
+        generation = self._config_generation
+        row = await self._fetchone('SELECT * FROM server_config WHERE guild_id = ?', (guild_id,))
+        config = dict(row) if row else None
+        # Skip caching if a config write landed while this read was in flight
+        if generation == self._config_generation:
+            self._config_cache[guild_id] = config
+            if len(self._config_cache) > self.config_cache_size:
+                self._config_cache.popitem(last=False)
+        return dict(config) if config else None
+
+    def config_cache_stats(self):
+        lookups = self.config_cache_hits + self.config_cache_misses
+        return {
+            'hits': self.config_cache_hits,
+            'misses': self.config_cache_misses,
+            'size': len(self._config_cache),
+            'hit_rate': self.config_cache_hits / lookups if lookups else 0.0,
+        }
 
     async def update_server_config(self, guild_id: int, **kwargs):
-        async with aiosqlite.connect(self.db_path) as db:
+        try:
+            await self._update_server_config(guild_id, **kwargs)
+        finally:
+            self._config_generation += 1
+            self._config_cache.pop(guild_id, None)
+
+    async def _update_server_config(self, guild_id: int, **kwargs):
+        async with self._write() as db:
             async with db.execute('SELECT guild_id FROM server_config WHERE guild_id = ?', (guild_id,)) as cursor:
                 exists = await cursor.fetchone()
             if exists:
@@ -98,126 +234,416 @@ class DatabaseManager:
                 placeholders = ', '.join(['?' for _ in columns])
                 values = [guild_id] + list(kwargs.values())
                 await db.execute(f'INSERT INTO server_config ({", ".join(columns)}) VALUES ({placeholders})', values)
-            await db.commit()
-
-    async def set_roles(self, guild_id: int, admin=None, staff=None, helper=None, viewer=None, blocked=None, reward=None):
-        d = {}
-        if admin is not None: d['admin_role_id'] = admin
-        if staff is not None: d['staff_role_id'] = staff
-        if helper is not None: d['helper_role_id'] = helper
-        if viewer is not None: d['viewer_role_id'] = viewer
-        if blocked is not None: d['blocked_role_id'] = blocked
-        if reward is not None: d['reward_role_id'] = reward
-        await self.update_server_config(guild_id, **d)
 
     # ===================== Point Values =====================
     async def get_point_values(self, guild_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT ticket_type, points FROM point_values WHERE guild_id = ?', (guild_id,)) as cursor:
-                rows = await cursor.fetchall()
-                return {row[0]: row[1] for row in rows} if rows else None
+        rows = await self._fetchall('SELECT ticket_type, points FROM point_values WHERE guild_id = ?', (guild_id,))
+        return {row[0]: row[1] for row in rows} if rows else None
 
     async def set_point_values(self, guild_id: int, point_values: dict):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             await db.execute('DELETE FROM point_values WHERE guild_id = ?', (guild_id,))
-            for ticket_type, points in point_values.items():
-                await db.execute(
-                    'INSERT INTO point_values (guild_id, ticket_type, points) VALUES (?, ?, ?)',
-                    (guild_id, ticket_type, points)
-                )
-            await db.commit()
+            await db.executemany(
+                'INSERT INTO point_values (guild_id, ticket_type, points) VALUES (?, ?, ?)',
+                [(guild_id, ticket_type, points) for ticket_type, points in point_values.items()]
+            )
 
     # ===================== Helper Slots =====================
     async def get_helper_slots(self, guild_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT ticket_type, slots FROM helper_slots WHERE guild_id = ?', (guild_id,)) as cursor:
-                rows = await cursor.fetchall()
-                return {row[0]: row[1] for row in rows} if rows else None
+        rows = await self._fetchall('SELECT ticket_type, slots FROM helper_slots WHERE guild_id = ?', (guild_id,))
+        return {row[0]: row[1] for row in rows} if rows else None
 
     async def set_helper_slots(self, guild_id: int, helper_slots: dict):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             await db.execute('DELETE FROM helper_slots WHERE guild_id = ?', (guild_id,))
-            for ticket_type, slots in helper_slots.items():
-                await db.execute(
-                    'INSERT INTO helper_slots (guild_id, ticket_type, slots) VALUES (?, ?, ?)',
-                    (guild_id, ticket_type, slots)
-                )
-            await db.commit()
+            await db.executemany(
+                'INSERT INTO helper_slots (guild_id, ticket_type, slots) VALUES (?, ?, ?)',
+                [(guild_id, ticket_type, slots) for ticket_type, slots in helper_slots.items()]
+            )
 
     # ===================== Custom Commands =====================
     async def get_custom_command(self, guild_id: int, command_name: str):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT content, image_url FROM custom_commands WHERE guild_id = ? AND command_name = ?', (guild_id, command_name)) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {'content': row[0], 'image_url': row[1]}
-                return None
+        row = await self._fetchone('SELECT content, image_url FROM custom_commands WHERE guild_id = ? AND command_name = ?', (guild_id, command_name))
+        if row:
+            return {'content': row[0], 'image_url': row[1]}
+        return None
 
     async def set_custom_command(self, guild_id: int, command_name: str, content: str, image_url: str = None):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             await db.execute('''
                 INSERT OR REPLACE INTO custom_commands (guild_id, command_name, content, image_url)
                 VALUES (?, ?, ?, ?)
             ''', (guild_id, command_name, content, image_url or ""))
-            await db.commit()
+
+    # ===================== Bot Meta =====================
+    async def get_meta(self, key: str):
+        row = await self._fetchone('SELECT value FROM bot_meta WHERE key = ?', (key,))
+        return row[0] if row else None
+
+    async def set_meta(self, key: str, value: str):
+        async with self._write() as db:
+            await db.execute('INSERT OR REPLACE INTO bot_meta (key, value) VALUES (?, ?)', (key, value))
+
+    # ===================== Point Write Buffer =====================
+    def _buffered_points(self, key):
+        return self._pending_points.get(key, 0) + self._flushing_points.get(key, 0)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        await self.flush_points()
+
+    async def flush_points(self):
+        """Write every buffered point delta to user_points in one transaction"""
+        async with self._flush_lock:
+            await self._flush_points_locked()
+
+    async def _flush_points_locked(self):
+        if not self._pending_points:
+            return
+        self._flushing_points, self._pending_points = self._pending_points, {}
+        self._flushing_events, self._pending_events = self._pending_events, []
+        written = len(self._flushing_events)
+        try:
+            async with self._write() as db:
+                await db.executemany(self._LEDGER_INSERT, self._flushing_events)
+                await db.executemany(self._ROLLUP_UPSERT, rollup_rows(self._flushing_events))
+                await db.executemany('''
+                    INSERT INTO user_points (guild_id, user_id, points) VALUES (?, ?, ?)
+                    ON CONFLICT (guild_id, user_id) DO UPDATE SET points = points + excluded.points
+                ''', [(guild_id, user_id, delta) for (guild_id, user_id), delta in self._flushing_points.items()])
+        except BaseException:
+            # Keep the deltas so the next flush retries them
+            for key, delta in self._flushing_points.items():
+                self._pending_points[key] = self._pending_points.get(key, 0) + delta
+            self._pending_events[:0] = self._flushing_events
+            raise
+        finally:
+            self._flushing_points = {}
+            self._flushing_events = []
+        self._ledger_written(written)
+
+    # ===================== Points Ledger =====================
+    _LEDGER_INSERT = '''
+        INSERT INTO points_ledger (guild_id, user_id, delta, reason, channel_id, actor_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    _ROLLUP_UPSERT = '''
+        INSERT INTO points_rollups (guild_id, period, bucket, user_id, points) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (guild_id, period, bucket, user_id) DO UPDATE SET points = points + excluded.points
+    '''
+
+    # Admin corrections move the current windows too, but never below zero: a window only holds points earned in it
+    _ROLLUP_CORRECT = '''
+        INSERT INTO points_rollups (guild_id, period, bucket, user_id, points) VALUES (?1, ?2, ?3, ?4, MAX(?5, 0))
+        ON CONFLICT (guild_id, period, bucket, user_id) DO UPDATE SET points = MAX(points + ?5, 0)
+    '''
+
+    async def _correct(self, db, events):
+        """Record admin corrections in the ledger and the current windows; user_points is the caller's job"""
+        await db.executemany(self._LEDGER_INSERT, events)
+        await db.executemany(self._ROLLUP_CORRECT, rollup_rows([event for event in events if event[2]]))
+
+    def _ledger_written(self, count: int):
+        self._ledger_since_snapshot += count
+        if self._ledger_since_snapshot >= self.snapshot_interval and self._snapshot_task is None:
+            # Copies every guild's user_points, so it runs as its own task instead of on the caller's path
+            self._snapshot_task = asyncio.create_task(self._snapshot_later())
+
+    async def _snapshot_later(self):
+        try:
+            await self.snapshot_points()
+        finally:
+            self._snapshot_task = None
+
+    async def snapshot_points(self):
+        """Copy user_points as of the newest ledger row so replay_points only has to read rows after it.
+
+        The copy is read in one reader transaction, which sees user_points and the ledger at the same
+        commit, and written in snapshot_batch-row transactions tagged with that ledger id. Replay ignores
+        it until the ledger_snapshots row is added at the end, so writers only ever wait for one batch.
+        """
+        async with self._snapshot_lock:
+            counted = self._ledger_since_snapshot
+            async with self._read() as conn:
+                await conn.execute("BEGIN")
+                try:
+                    async with conn.execute('SELECT COALESCE(MAX(id), 0) FROM points_ledger') as cursor:
+                        ledger_id = (await cursor.fetchone())[0]
+                    async with conn.execute('SELECT guild_id, user_id, points FROM user_points WHERE points != 0') as cursor:
+                        while batch := await cursor.fetchmany(self.snapshot_batch):
+                            async with self._write() as db:
+                                await db.executemany(
+                                    'INSERT OR REPLACE INTO points_snapshots (ledger_id, guild_id, user_id, points) VALUES (?, ?, ?, ?)',
+                                    [(ledger_id, *row) for row in batch]
+                                )
+                finally:
+                    await conn.execute("COMMIT")
+            async with self._write() as db:
+                await db.execute('INSERT OR REPLACE INTO ledger_snapshots (ledger_id, taken_at) VALUES (?, ?)', (ledger_id, int(time.time())))
+            # Rows written while the copy ran count towards the next snapshot
+            self._ledger_since_snapshot = max(self._ledger_since_snapshot - counted, 0)
+            # Older copies are unreachable now; drop them a batch at a time too
+            while True:
+                async with self._write() as db:
+                    cursor = await db.execute('''
+                        DELETE FROM points_snapshots WHERE rowid IN (
+                            SELECT rowid FROM points_snapshots WHERE ledger_id < ? LIMIT ?
+                        )
+                    ''', (ledger_id, self.snapshot_batch))
+                if cursor.rowcount < self.snapshot_batch:
+                    break
+
+    async def replay_points(self, guild_id: int):
+        """Rebuild a guild's totals from the latest snapshot plus the ledger rows after it"""
+        await self.flush_points()
+        rows = await self._fetchall('''
+            SELECT user_id, SUM(points) FROM (
+                SELECT user_id, points FROM points_snapshots
+                WHERE ledger_id = (SELECT COALESCE(MAX(ledger_id), 0) FROM ledger_snapshots) AND guild_id = ?
+                UNION ALL
+                SELECT user_id, delta FROM points_ledger
+                WHERE guild_id = ? AND id > (SELECT COALESCE(MAX(ledger_id), 0) FROM ledger_snapshots)
+            ) GROUP BY user_id HAVING SUM(points) != 0
+        ''', (guild_id, guild_id))
+        return {row[0]: row[1] for row in rows}
+
+    async def get_points_history(self, guild_id: int, user_id: int, before_id: int = None, limit: int = 10):
+        """Return up to `limit` ledger rows for a user, newest first, older than ledger id `before_id`"""
+        await self.flush_points()
+        rows = await self._fetchall('''
+            SELECT id, delta, reason, channel_id, actor_id, created_at FROM points_ledger
+            WHERE guild_id = ? AND user_id = ? AND id < ? ORDER BY id DESC LIMIT ?
+        ''', (guild_id, user_id, before_id if before_id is not None else 2 ** 63 - 1, limit))
+        return [dict(row) for row in rows]
+
+    # ===================== Leaderboard Index =====================
+    async def _leaderboard(self, guild_id: int):
+        index = self._leaderboards.get(guild_id)
+        if index is not None:
+            return index
+        # Holding the flush lock keeps user_points stable while the index is loaded;
+        # awards buffered meanwhile are still in _pending_points and applied after
+        async with self._flush_lock:
+            index = self._leaderboards.get(guild_id)
+            if index is None:
+                await self._flush_points_locked()
+                rows = await self._fetchall('SELECT user_id, points FROM user_points WHERE guild_id = ?', (guild_id,))
+                index = LeaderboardIndex(rows)
+                for (pending_guild, user_id), delta in self._pending_points.items():
+                    if pending_guild == guild_id:
+                        index.add(user_id, delta)
+                self._leaderboards[guild_id] = index
+        return index
+
+    async def get_top_points(self, guild_id: int, limit: int = 10, window: str = "all"):
+        """Return the top `limit` (user_id, points) pairs, highest first, all-time or for the current window"""
+        if window == "all":
+            return (await self._leaderboard(guild_id)).top(limit)
+        await self.flush_points()
+        rows = await self._fetchall('''
+            SELECT user_id, points FROM points_rollups
+            WHERE guild_id = ? AND period = ? AND bucket = ? AND points != 0
+            ORDER BY points DESC, user_id LIMIT ?
+        ''', (guild_id, window, current_bucket(window), limit))
+        return [(row[0], row[1]) for row in rows]
+
+    async def get_user_rank(self, guild_id: int, user_id: int, window: str = "all"):
+        """Return (rank, points) for a user, or None if they are not on the leaderboard"""
+        if window == "all":
+            index = await self._leaderboard(guild_id)
+            rank = index.rank(user_id)
+            return (rank, index.get(user_id)) if rank else None
+        await self.flush_points()
+        key = (guild_id, window, current_bucket(window))
+        row = await self._fetchone('SELECT points FROM points_rollups WHERE guild_id = ? AND period = ? AND bucket = ? AND user_id = ?', key + (user_id,))
+        if row is None or row[0] == 0:
+            return None
+        points = row[0]
+        # Same ordering as the top list: points desc, then user id; counted on the rank index
+        ahead = await self._fetchone('''
+            SELECT COUNT(*) FROM points_rollups
+            WHERE guild_id = ? AND period = ? AND bucket = ? AND points != 0
+              AND (points > ? OR (points = ? AND user_id < ?))
+        ''', key + (points, points, user_id))
+        return ahead[0] + 1, points
 
     # ===================== User Points =====================
     async def get_user_points(self, guild_id: int, user_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT points FROM user_points WHERE guild_id = ? AND user_id = ?', (guild_id, user_id)) as cursor:
-                row = await cursor.fetchone()
-                return row[0] if row else 0
+        index = self._leaderboards.get(guild_id)
+        if index is not None:
+            return index.get(user_id) or 0
+        key = (guild_id, user_id)
+        sql = 'SELECT points FROM user_points WHERE guild_id = ? AND user_id = ?'
+        if not self._buffered_points(key):
+            row = await self._fetchone(sql, key)
+            return row[0] if row else 0
+        # Serialize with flush_points so an in-flight delta is counted exactly once
+        async with self._flush_lock:
+            row = await self._fetchone(sql, key)
+            return (row[0] if row else 0) + self._pending_points.get(key, 0)
 
-    async def set_user_points(self, guild_id: int, user_id: int, amount: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('INSERT OR REPLACE INTO user_points (guild_id, user_id, points) VALUES (?, ?, ?)', (guild_id, user_id, amount))
-            await db.commit()
+    async def set_user_points(self, guild_id: int, user_id: int, amount: int, actor_id: int = None):
+        async with self._flush_lock:
+            # Buffered awards happened before the set, so they are recorded first
+            await self._flush_points_locked()
+            async with self._write() as db:
+                async with db.execute('SELECT points FROM user_points WHERE guild_id = ? AND user_id = ?', (guild_id, user_id)) as cursor:
+                    row = await cursor.fetchone()
+                await self._correct(db, [(guild_id, user_id, amount - (row[0] if row else 0), 'set', None, actor_id, int(time.time()))])
+                await db.execute('INSERT OR REPLACE INTO user_points (guild_id, user_id, points) VALUES (?, ?, ?)', (guild_id, user_id, amount))
+            if guild_id in self._leaderboards:
+                # Awards buffered while the write was in flight still apply on top
+                self._leaderboards[guild_id].set(user_id, amount + self._pending_points.get((guild_id, user_id), 0))
 
-    async def add_user_points(self, guild_id: int, user_id: int, amount: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('''
-                INSERT OR REPLACE INTO user_points (guild_id, user_id, points)
-                VALUES (?, ?, COALESCE((SELECT points FROM user_points WHERE guild_id = ? AND user_id = ?), 0) + ?)
-            ''', (guild_id, user_id, guild_id, user_id, amount))
-            await db.commit()
+    async def add_points_bulk(self, guild_id: int, user_ids: list, amount: int, reason: str = "add", channel_id: int = None,
+                              actor_id: int = None):
+        """Buffer the same award for several users; written by the next flush"""
+        index = self._leaderboards.get(guild_id)
+        now = int(time.time())
+        for user_id in user_ids:
+            key = (guild_id, user_id)
+            self._pending_points[key] = self._pending_points.get(key, 0) + amount
+            self._pending_events.append((guild_id, user_id, amount, reason, channel_id, actor_id, now))
+            if index is not None:
+                index.add(user_id, amount)
+        if len(self._pending_points) >= self.flush_threshold:
+            await self.flush_points()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
 
     async def get_all_user_points(self, guild_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT user_id, points FROM user_points WHERE guild_id = ? ORDER BY points DESC', (guild_id,)) as cursor:
-                return {row[0]: row[1] for row in await cursor.fetchall()}
+        await self.flush_points()
+        rows = await self._fetchall('SELECT user_id, points FROM user_points WHERE guild_id = ? ORDER BY points DESC', (guild_id,))
+        return {row[0]: row[1] for row in rows}
 
-    async def clear_all_points(self, guild_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('DELETE FROM user_points WHERE guild_id = ?', (guild_id,))
-            await db.commit()
+    async def clear_all_points(self, guild_id: int, actor_id: int = None):
+        async with self._flush_lock:
+            await self._flush_points_locked()
+            async with self._write() as db:
+                # The reset is recorded as one negating row per user so replay still adds up
+                async with db.execute('SELECT user_id, points FROM user_points WHERE guild_id = ? AND points != 0', (guild_id,)) as cursor:
+                    rows = await cursor.fetchall()
+                now = int(time.time())
+                await self._correct(db, [(guild_id, user_id, -points, 'reset', None, actor_id, now) for user_id, points in rows])
+                await db.execute('DELETE FROM user_points WHERE guild_id = ?', (guild_id,))
+            if guild_id in self._leaderboards:
+                self._leaderboards[guild_id] = LeaderboardIndex(
+                    (user_id, delta) for (pending_guild, user_id), delta in self._pending_points.items() if pending_guild == guild_id
+                )
 
-    async def remove_user(self, guild_id: int, user_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('DELETE FROM user_points WHERE guild_id = ? AND user_id = ?', (guild_id, user_id))
-            await db.commit()
+    async def remove_user(self, guild_id: int, user_id: int, actor_id: int = None):
+        async with self._flush_lock:
+            await self._flush_points_locked()
+            async with self._write() as db:
+                async with db.execute('SELECT points FROM user_points WHERE guild_id = ? AND user_id = ? AND points != 0', (guild_id, user_id)) as cursor:
+                    row = await cursor.fetchone()
+                if row:
+                    await self._correct(db, [(guild_id, user_id, -row[0], 'remove', None, actor_id, int(time.time()))])
+                await db.execute('DELETE FROM user_points WHERE guild_id = ? AND user_id = ?', (guild_id, user_id))
+            if guild_id in self._leaderboards:
+                if (guild_id, user_id) in self._pending_points:
+                    self._leaderboards[guild_id].set(user_id, self._pending_points[(guild_id, user_id)])
+                else:
+                    self._leaderboards[guild_id].discard(user_id)
 
     # ===================== Ticket Methods =====================
     async def get_next_ticket_number(self, guild_id: int, ticket_type: str):
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute('SELECT MAX(ticket_number) FROM active_tickets WHERE guild_id = ? AND ticket_type = ?', (guild_id, ticket_type)) as cursor:
-                row = await cursor.fetchone()
-                return (row[0] or 0) + 1
+        """Allocate the next number for a ticket type; only the first call per type touches the DB"""
+        key = (guild_id, ticket_type)
+        if key not in self._ticket_sequences:
+            async with self._sequence_lock:
+                if key not in self._ticket_sequences:
+                    row = await self._fetchone('SELECT last_number FROM ticket_sequences WHERE guild_id = ? AND ticket_type = ?', key)
+                    if row is None:
+                        # Seed from tickets opened before the sequence table existed
+                        row = await self._fetchone('SELECT MAX(ticket_number) FROM active_tickets WHERE guild_id = ? AND ticket_type = ?', key)
+                    self._ticket_sequences[key] = row[0] or 0
+        # No await between read and increment, so concurrent callers never share a number
+        self._ticket_sequences[key] += 1
+        return self._ticket_sequences[key]
+
+    async def save_active_ticket(self, guild_id: int, channel_id: int, creator_id: int, ticket_type: str, ticket_number: int, message_id: int = None):
+        async with self._write() as db:
+            await db.execute('INSERT INTO active_tickets (guild_id, channel_id, creator_id, ticket_type, ticket_number, message_id) VALUES (?, ?, ?, ?, ?, ?)', (guild_id, channel_id, creator_id, ticket_type, ticket_number, message_id))
+            # Persist the high-water mark with the ticket so numbering survives restarts
+            await db.execute('''
+                INSERT INTO ticket_sequences (guild_id, ticket_type, last_number) VALUES (?, ?, ?)
+                ON CONFLICT (guild_id, ticket_type) DO UPDATE SET last_number = MAX(last_number, excluded.last_number)
+            ''', (guild_id, ticket_type, ticket_number))
+
+    async def set_ticket_message(self, channel_id: int, message_id: int):
+        async with self._write() as db:
+            await db.execute('UPDATE active_tickets SET message_id = ? WHERE channel_id = ?', (message_id, channel_id))
+
+    _TICKET_QUERY = '''
+        SELECT t.guild_id, t.channel_id, t.creator_id, t.ticket_type, t.ticket_number, t.message_id, h.user_id AS helper_id
+        FROM active_tickets t LEFT JOIN ticket_helpers h ON h.channel_id = t.channel_id
+    '''
+
+    async def get_active_ticket(self, channel_id: int):
+        rows = await self._fetchall(self._TICKET_QUERY + 'WHERE t.channel_id = ? ORDER BY h.slot', (channel_id,))
+        tickets = group_ticket_rows(rows)
+        return tickets[0] if tickets else None
+
+    async def get_active_tickets(self):
+        """Load every open ticket with its helpers in one query"""
+        rows = await self._fetchall(self._TICKET_QUERY + 'ORDER BY t.channel_id, h.slot')
+        return group_ticket_rows(rows)
 
-    async def save_active_ticket(self, guild_id: int, channel_id: int, creator_id: int, ticket_type: str, ticket_number: int):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('INSERT INTO active_tickets (guild_id, channel_id, creator_id, ticket_type, ticket_number, helpers) VALUES (?, ?, ?, ?, ?, ?)', (guild_id, channel_id, creator_id, ticket_type, ticket_number, ""))
-            await db.commit()
+    async def get_helper_tickets(self, guild_id: int, user_id: int):
+        """Channel ids of the open tickets a helper is currently in"""
+        # CROSS JOIN pins the join order: start from the helper's few rows, not from every open ticket in the guild
+        rows = await self._fetchall('''
+            SELECT t.channel_id FROM ticket_helpers h CROSS JOIN active_tickets t ON t.channel_id = h.channel_id
+            WHERE h.user_id = ? AND t.guild_id = ?
+        ''', (user_id, guild_id))
+        return [row[0] for row in rows]
 
     async def remove_active_ticket(self, guild_id: int, channel_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             await db.execute('DELETE FROM active_tickets WHERE guild_id = ? AND channel_id = ?', (guild_id, channel_id))
-            await db.commit()
+            await db.execute('DELETE FROM ticket_helpers WHERE channel_id = ?', (channel_id,))
+
+    async def close_ticket(self, guild_id: int, channel_id: int, helper_ids: list, points: int, actor_id: int = None):
+        """Award points to a ticket's helpers and remove it in one transaction; False if it was already closed"""
+        # Flush lock: the leaderboard index must not be hydrated between the commit and the index update
+        async with self._flush_lock:
+            async with self._write() as db:
+                cursor = await db.execute('DELETE FROM active_tickets WHERE guild_id = ? AND channel_id = ?', (guild_id, channel_id))
+                if cursor.rowcount == 0:
+                    return False
+                await db.execute('DELETE FROM ticket_helpers WHERE channel_id = ?', (channel_id,))
+                if points and helper_ids:
+                    now = int(time.time())
+                    events = [(guild_id, user_id, points, 'ticket', channel_id, actor_id, now) for user_id in helper_ids]
+                    await db.executemany(self._LEDGER_INSERT, events)
+                    await db.executemany(self._ROLLUP_UPSERT, rollup_rows(events))
+                    await db.executemany('''
+                        INSERT INTO user_points (guild_id, user_id, points) VALUES (?, ?, ?)
+                        ON CONFLICT (guild_id, user_id) DO UPDATE SET points = points + excluded.points
+                    ''', [(guild_id, user_id, points) for user_id in helper_ids])
+            index = self._leaderboards.get(guild_id)
+            if index is not None and points:
+                for user_id in helper_ids:
+                    index.add(user_id, points)
+        if points and helper_ids:
+            self._ledger_written(len(helper_ids))
+        return True
+
+    async def add_ticket_helper(self, channel_id: int, user_id: int):
+        """Append a helper to the next slot of a ticket"""
+        async with self._write() as db:
+            await db.execute('''
+                INSERT OR IGNORE INTO ticket_helpers (channel_id, user_id, slot)
+                VALUES (?, ?, (SELECT COALESCE(MAX(slot), -1) + 1 FROM ticket_helpers WHERE channel_id = ?))
+            ''', (channel_id, user_id, channel_id))
+
+    async def remove_ticket_helper(self, channel_id: int, user_id: int):
+        async with self._write() as db:
+            await db.execute('DELETE FROM ticket_helpers WHERE channel_id = ? AND user_id = ?', (channel_id, user_id))
 
-    async def update_ticket_helpers(self, guild_id: int, channel_id: int, helpers: list):
-        helpers_str = ",".join(str(h) for h in helpers)
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('UPDATE active_tickets SET helpers = ? WHERE guild_id = ? AND channel_id = ?', (helpers_str, guild_id, channel_id))
-            await db.commit()
+# Every public method is timed for /metrics
+time_methods(DatabaseManager)
 
-# Singleton instance
-db = DatabaseManager()
@@ -0,0 +1,57 @@
+# leaderboard.py
+from datetime import datetime, timezone
+from itertools import islice
+from sortedcontainers import SortedList
+
+class LeaderboardIndex:
+    """Points of one guild kept ordered by (points desc, user_id) for O(log n) rank lookups"""
+    __slots__ = ("_points", "_ranked")
+
+    def __init__(self, rows=()):
+        self._points = {user_id: points for user_id, points in rows}
+        self._ranked = SortedList((-points, user_id) for user_id, points in self._points.items())
+
+    def __len__(self):
+        return len(self._points)
+
+    def get(self, user_id: int):
+        return self._points.get(user_id)
+
+    def set(self, user_id: int, points: int):
+        old = self._points.get(user_id)
+        if old is not None:
+            self._ranked.remove((-old, user_id))
+        self._points[user_id] = points
+        self._ranked.add((-points, user_id))
+
+    def add(self, user_id: int, delta: int):
+        self.set(user_id, self._points.get(user_id, 0) + delta)
+
+    def discard(self, user_id: int):
+        old = self._points.pop(user_id, None)
+        if old is not None:
+            self._ranked.remove((-old, user_id))
+
+    def top(self, limit: int):
+        """Return the first `limit` (user_id, points) pairs"""
+        return [(user_id, -neg_points) for neg_points, user_id in islice(self._ranked, limit)]
+
+    def rank(self, user_id: int):
+        """Return the 1-based position of a user, or None if they have no entry"""
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return self._ranked.index((-points, user_id)) + 1
+
+# Leaderboard windows served from points_rollups; "all" is user_points itself
+WINDOWS = ("week", "month", "season")
+
+def rollup_buckets(timestamp: int):
+    """Return {window: bucket key} for a unix timestamp, in UTC (seasons are calendar quarters)"""
+    day = datetime.fromtimestamp(timestamp, timezone.utc)
+    year, week, _ = day.isocalendar()
+    return {
+        "week": f"{year}-W{week:02d}",
+        "month": f"{day.year}-{day.month:02d}",
+        "season": f"{day.year}-Q{(day.month - 1) // 3 + 1}",
+    }
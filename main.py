@@ -1,20 +1,23 @@
 import discord
 from discord.ext import commands
 import asyncio
+import hashlib
+import json
 import logging
-from config import TOKEN  # Uses TOKEN from config.py
-from database import DatabaseManager
-from webserver import start_webserver
+import signal
+from config import TOKEN, DB_PROFILE, SHARD_COUNT, STUB_GATEWAY, DEV_GUILD_ID, DATABASE_URL  # Uses TOKEN from config.py
+from storage import create_storage
+import metrics
+import timing
+from sharding import ShardHealth, StubGateway
+from webserver import WebServer
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Database manager
-db = DatabaseManager()
-
-class TicketBot(commands.Bot):
-    def __init__(self):
+class TicketBot(commands.AutoShardedBot):
+    def __init__(self, shard_ids=None, shard_count=None, port=None):
         intents = discord.Intents.default()
         intents.message_content = True
         intents.guilds = True
@@ -22,22 +25,41 @@ class TicketBot(commands.Bot):
         super().__init__(
             command_prefix='/',  # Use slash for consistency with slash commands
             intents=intents,
-            help_command=None
+            help_command=None,
+            tree_cls=metrics.InstrumentedCommandTree,
+            http_trace=timing.http_trace(),
+            shard_ids=shard_ids,
+            shard_count=shard_count
         )
-        self.db = db  # Make database accessible to cogs
+        self.db = create_storage(DATABASE_URL)  # Shared storage backend, injected into every cog and view
+        self.shard_health = ShardHealth(shard_ids or ())
+        self.webserver = WebServer(self, port=port)
 
     async def setup_hook(self):
-        """Load all cogs when the bot starts"""
+        """Open the database pool and load all cogs when the bot starts"""
+        await self.db.connect()
+        logger.info("✅ Database pool opened")
+        if DB_PROFILE and self.db.supports_profiling:
+            self.db.enable_profiling()
+            logger.info("🔬 Database query profiling enabled")
+        elif DB_PROFILE:
+            logger.warning(f"⚠️ {type(self.db).__name__} does not support query profiling")
+        metrics.install(self)
+        await self.webserver.start()
+        # Schema must exist before cogs restore state from it
+        await self.db.initialize_database()
+        logger.info("✅ Database initialized")
         try:
             # Load Points System
             await self.load_extension("modules.points.commands")
             logger.info("✅ Points commands loaded")
+            await self.load_extension("modules.points.points_extra")
+            logger.info("✅ Points history loaded")
             # Remove legacy/extra/custom modules if not using them
             # await self.load_extension("modules.points.custom_commands")
-            # await self.load_extension("modules.points.points_extra")
             
             # Load Setup System
-            await self.load_extension("modules.setup.setup_command")
+            await self.load_extension("modules.setup.setup_commands")
             logger.info("✅ Setup commands loaded")
             # await self.load_extension("modules.setup.setup_custom_commands")
             # await self.load_extension("modules.setup.setup_reset")
@@ -45,40 +67,100 @@ class TicketBot(commands.Bot):
             # Load Ticket System
             await self.load_extension("modules.tickets.panel_command")
             logger.info("✅ Ticket panel loaded")
-            # await self.load_extension("modules.tickets.ticket_commands")  # Only if you have this
+            await self.load_extension("modules.tickets.ticket_commands")
+            logger.info("✅ Ticket commands loaded")
             
             # Load Help System
             await self.load_extension("modules.utils.help_commands")
             logger.info("✅ Help commands loaded")
+            await self.load_extension("modules.utils.stats_commands")
+            logger.info("✅ Stats commands loaded")
             
             logger.info("🎉 All modules loaded successfully!")
         except Exception as e:
             logger.error(f"❌ Error loading modules: {e}")
+        await self.sync_commands()
 
-    async def on_ready(self):
-        """Called when bot is ready"""
-        logger.info(f"🚀 Logged in as {self.user} (ID: {self.user.id})")
-        # Initialize database
-        await db.initialize_database()
-        logger.info("✅ Database initialized")
-        # Sync slash commands
+    def command_tree_hash(self, guild=None) -> str:
+        payload = sorted((command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)), key=lambda c: c["name"])
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    async def sync_commands(self):
+        """Sync slash commands once per deploy, only when their definitions changed since the last sync"""
+        if self.application_id is None:
+            logger.info("⏭️ Not logged in; skipping slash command sync")
+            return
+        if self.shard_ids and 0 not in self.shard_ids:
+            return  # the cluster serving shard 0 syncs for everyone
+        guild = discord.Object(DEV_GUILD_ID) if DEV_GUILD_ID else None
+        if guild is not None:
+            self.tree.copy_global_to(guild=guild)
+        key = f"command_hash:{self.application_id}:{DEV_GUILD_ID or 'global'}"
+        digest = self.command_tree_hash(guild)
+        if await self.db.get_meta(key) == digest:
+            logger.info("✅ Slash commands unchanged; skipping sync")
+            return
         try:
-            synced = await self.tree.sync()
-            logger.info(f"✅ Synced {len(synced)} slash commands")
+            synced = await self.tree.sync(guild=guild)
+            await self.db.set_meta(key, digest)
+            logger.info(f"✅ Synced {len(synced)} slash commands" + (f" to guild {DEV_GUILD_ID}" if guild else ""))
         except Exception as e:
             logger.error(f"❌ Failed to sync commands: {e}")
+
+    async def on_ready(self):
+        """Called on every (re)connect; one-time startup work belongs in setup_hook"""
+        logger.info(f"🚀 Logged in as {self.user} (ID: {self.user.id})")
         logger.info("🎫 Bot is ready! Ticket system online.")
 
-# Create bot instance
-bot = TicketBot()
+    async def on_shard_connect(self, shard_id):
+        self.shard_health.mark(shard_id, "connecting")
+
+    async def on_shard_ready(self, shard_id):
+        self.shard_health.mark(shard_id, "ready")
+        logger.info(f"✅ Shard {shard_id} ready")
+
+    async def on_shard_resumed(self, shard_id):
+        self.shard_health.mark(shard_id, "ready")
+        logger.info(f"🔄 Shard {shard_id} resumed")
+
+    async def on_shard_disconnect(self, shard_id):
+        self.shard_health.mark(shard_id, "disconnected")
+        logger.warning(f"⚠️ Shard {shard_id} disconnected")
 
-# Start webserver in background
-start_webserver()
+    async def close(self):
+        """Stop the webserver, disconnect from Discord, then close the database pool"""
+        await self.webserver.stop()
+        await super().close()
+        if self.db.profiler is not None:
+            logger.info("🔬 Database query profile:\n" + self.db.profiler.dump())
+        await self.db.close()
+        logger.info("✅ Database pool closed")
+
+async def run_bot(shard_ids=None, shard_count=SHARD_COUNT, port=None, stub_gateway=STUB_GATEWAY):
+    """Run one bot process until it closes or receives SIGTERM or SIGINT"""
+    bot = TicketBot(shard_ids, shard_count, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    # Ctrl-C on cluster.py reaches every worker in the process group; both signals take the graceful path
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    async with bot:
+        runner = asyncio.create_task(StubGateway(bot).run() if stub_gateway else bot.start(TOKEN))
+        stopper = asyncio.create_task(stop.wait())
+        await asyncio.wait({runner, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        stopper.cancel()
+        if not runner.done():
+            # Close first so buffered points are flushed, then stop the gateway task
+            await bot.close()
+            runner.cancel()
+        try:
+            await runner
+        except asyncio.CancelledError:
+            pass
 
 # Run the bot
 async def main():
-    async with bot:
-        await bot.start(TOKEN)  # Uses TOKEN from config.py
+    await run_bot()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,246 @@
+# memory_storage.py
+import itertools
+import time
+from datetime import datetime, timezone
+from leaderboard import LeaderboardIndex
+from metrics import time_methods
+from migrations import SCHEMA_VERSION
+from storage import SERVER_CONFIG_COLUMNS, Storage, current_bucket, rollup_rows
+
+def _now_text():
+    # Same format as SQLite's CURRENT_TIMESTAMP
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+class MemoryStorage(Storage):
+    """Plain dicts in this process, for tests and benchmarks; nothing survives a restart.
+
+    Every method runs to completion without awaiting, so each one is atomic on the event loop.
+    """
+
+    def __init__(self):
+        self._configs = {}
+        self._point_values = {}
+        self._helper_slots = {}
+        self._custom_commands = {}
+        self._meta = {}
+        # guild_id -> LeaderboardIndex of all-time totals
+        self._points = {}
+        # (guild_id, period, bucket) -> {user_id: points}
+        self._rollups = {}
+        self._ledger = []
+        self._ledger_ids = itertools.count(1)
+        self._snapshot = ({}, 0)
+        self._sequences = {}
+        self._tickets = {}
+
+    # ===================== Lifecycle =====================
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def ping(self):
+        pass
+
+    async def initialize_database(self):
+        return SCHEMA_VERSION, SCHEMA_VERSION
+
+    # ===================== Server Config =====================
+    async def get_server_config(self, guild_id: int):
+        config = self._configs.get(guild_id)
+        return dict(config) if config else None
+
+    async def update_server_config(self, guild_id: int, **kwargs):
+        config = self._configs.get(guild_id)
+        if config is None:
+            config = dict.fromkeys(SERVER_CONFIG_COLUMNS)
+            config.update(guild_id=guild_id, created_at=_now_text())
+            self._configs[guild_id] = config
+        config.update(kwargs, updated_at=_now_text())
+
+    async def get_point_values(self, guild_id: int):
+        return dict(self._point_values[guild_id]) if self._point_values.get(guild_id) else None
+
+    async def set_point_values(self, guild_id: int, point_values: dict):
+        self._point_values[guild_id] = dict(point_values)
+
+    async def get_helper_slots(self, guild_id: int):
+        return dict(self._helper_slots[guild_id]) if self._helper_slots.get(guild_id) else None
+
+    async def set_helper_slots(self, guild_id: int, helper_slots: dict):
+        self._helper_slots[guild_id] = dict(helper_slots)
+
+    # ===================== Custom Commands =====================
+    async def get_custom_command(self, guild_id: int, command_name: str):
+        command = self._custom_commands.get((guild_id, command_name))
+        return dict(command) if command else None
+
+    async def set_custom_command(self, guild_id: int, command_name: str, content: str, image_url: str = None):
+        self._custom_commands[(guild_id, command_name)] = {'content': content, 'image_url': image_url or ""}
+
+    # ===================== Bot Meta =====================
+    async def get_meta(self, key: str):
+        return self._meta.get(key)
+
+    async def set_meta(self, key: str, value: str):
+        self._meta[key] = value
+
+    # ===================== Points =====================
+    def _index(self, guild_id: int):
+        if guild_id not in self._points:
+            self._points[guild_id] = LeaderboardIndex()
+        return self._points[guild_id]
+
+    def _record(self, events):
+        for guild_id, user_id, delta, reason, channel_id, actor_id, created_at in events:
+            self._ledger.append({
+                'id': next(self._ledger_ids), 'guild_id': guild_id, 'user_id': user_id, 'delta': delta, 'reason': reason,
+                'channel_id': channel_id, 'actor_id': actor_id, 'created_at': created_at,
+            })
+
+    def _award(self, guild_id: int, user_ids: list, amount: int, reason: str, channel_id: int, actor_id: int):
+        now = int(time.time())
+        events = [(guild_id, user_id, amount, reason, channel_id, actor_id, now) for user_id in user_ids]
+        self._record(events)
+        for guild, period, bucket, user_id, points in rollup_rows(events):
+            totals = self._rollups.setdefault((guild, period, bucket), {})
+            totals[user_id] = totals.get(user_id, 0) + points
+        index = self._index(guild_id)
+        for user_id in user_ids:
+            index.add(user_id, amount)
+
+    def _correct(self, events):
+        """Admin corrections: ledger rows, plus current windows moved by the same deltas but never below zero"""
+        self._record(events)
+        for guild, period, bucket, user_id, points in rollup_rows([event for event in events if event[2]]):
+            totals = self._rollups.setdefault((guild, period, bucket), {})
+            totals[user_id] = max(totals.get(user_id, 0) + points, 0)
+
+    async def get_user_points(self, guild_id: int, user_id: int):
+        return self._index(guild_id).get(user_id) or 0
+
+    async def set_user_points(self, guild_id: int, user_id: int, amount: int, actor_id: int = None):
+        index = self._index(guild_id)
+        self._correct([(guild_id, user_id, amount - (index.get(user_id) or 0), 'set', None, actor_id, int(time.time()))])
+        index.set(user_id, amount)
+
+    async def add_points_bulk(self, guild_id: int, user_ids: list, amount: int, reason: str = "add", channel_id: int = None,
+                              actor_id: int = None):
+        self._award(guild_id, user_ids, amount, reason, channel_id, actor_id)
+
+    async def get_all_user_points(self, guild_id: int):
+        index = self._index(guild_id)
+        return dict(index.top(len(index)))
+
+    async def clear_all_points(self, guild_id: int, actor_id: int = None):
+        index = self._index(guild_id)
+        now = int(time.time())
+        self._correct([(guild_id, user_id, -points, 'reset', None, actor_id, now) for user_id, points in index.top(len(index)) if points])
+        self._points[guild_id] = LeaderboardIndex()
+
+    async def remove_user(self, guild_id: int, user_id: int, actor_id: int = None):
+        index = self._index(guild_id)
+        points = index.get(user_id)
+        if points:
+            self._correct([(guild_id, user_id, -points, 'remove', None, actor_id, int(time.time()))])
+        index.discard(user_id)
+
+    def _window(self, guild_id: int, window: str):
+        """[(user_id, points)] of the current bucket, ordered like the all-time leaderboard"""
+        totals = self._rollups.get((guild_id, window, current_bucket(window)), {})
+        return sorted(((user_id, points) for user_id, points in totals.items() if points), key=lambda item: (-item[1], item[0]))
+
+    async def get_top_points(self, guild_id: int, limit: int = 10, window: str = "all"):
+        if window == "all":
+            return self._index(guild_id).top(limit)
+        return self._window(guild_id, window)[:limit]
+
+    async def get_user_rank(self, guild_id: int, user_id: int, window: str = "all"):
+        if window == "all":
+            index = self._index(guild_id)
+            rank = index.rank(user_id)
+            return (rank, index.get(user_id)) if rank else None
+        for rank, (ranked_id, points) in enumerate(self._window(guild_id, window), 1):
+            if ranked_id == user_id:
+                return rank, points
+        return None
+
+    async def get_points_history(self, guild_id: int, user_id: int, before_id: int = None, limit: int = 10):
+        rows = []
+        for row in reversed(self._ledger):
+            if len(rows) == limit:
+                break
+            if row['guild_id'] == guild_id and row['user_id'] == user_id and (before_id is None or row['id'] < before_id):
+                rows.append({key: row[key] for key in ('id', 'delta', 'reason', 'channel_id', 'actor_id', 'created_at')})
+        return rows
+
+    async def replay_points(self, guild_id: int):
+        snapshot, ledger_id = self._snapshot
+        totals = dict(snapshot.get(guild_id, {}))
+        for row in self._ledger:
+            if row['id'] > ledger_id and row['guild_id'] == guild_id:
+                totals[row['user_id']] = totals.get(row['user_id'], 0) + row['delta']
+        return {user_id: points for user_id, points in totals.items() if points}
+
+    async def snapshot_points(self):
+        snapshot = {guild_id: dict(index.top(len(index))) for guild_id, index in self._points.items()}
+        self._snapshot = (snapshot, self._ledger[-1]['id'] if self._ledger else 0)
+
+    # ===================== Tickets =====================
+    async def get_next_ticket_number(self, guild_id: int, ticket_type: str):
+        key = (guild_id, ticket_type)
+        self._sequences[key] = self._sequences.get(key, 0) + 1
+        return self._sequences[key]
+
+    async def save_active_ticket(self, guild_id: int, channel_id: int, creator_id: int, ticket_type: str, ticket_number: int, message_id: int = None):
+        if channel_id in self._tickets:
+            raise ValueError(f"Ticket already exists for channel {channel_id}")
+        self._tickets[channel_id] = {
+            'guild_id': guild_id, 'channel_id': channel_id, 'creator_id': creator_id, 'ticket_type': ticket_type,
+            'ticket_number': ticket_number, 'message_id': message_id, 'helpers': [],
+        }
+        key = (guild_id, ticket_type)
+        self._sequences[key] = max(self._sequences.get(key, 0), ticket_number)
+
+    async def set_ticket_message(self, channel_id: int, message_id: int):
+        ticket = self._tickets.get(channel_id)
+        if ticket is not None:
+            ticket['message_id'] = message_id
+
+    async def get_active_ticket(self, channel_id: int):
+        ticket = self._tickets.get(channel_id)
+        return dict(ticket, helpers=list(ticket['helpers'])) if ticket else None
+
+    async def get_active_tickets(self):
+        return [dict(ticket, helpers=list(ticket['helpers'])) for _, ticket in sorted(self._tickets.items())]
+
+    async def get_helper_tickets(self, guild_id: int, user_id: int):
+        return [channel_id for channel_id, ticket in self._tickets.items() if ticket['guild_id'] == guild_id and user_id in ticket['helpers']]
+
+    async def remove_active_ticket(self, guild_id: int, channel_id: int):
+        ticket = self._tickets.get(channel_id)
+        if ticket is not None and ticket['guild_id'] == guild_id:
+            del self._tickets[channel_id]
+
+    async def close_ticket(self, guild_id: int, channel_id: int, helper_ids: list, points: int, actor_id: int = None):
+        ticket = self._tickets.get(channel_id)
+        if ticket is None or ticket['guild_id'] != guild_id:
+            return False
+        del self._tickets[channel_id]
+        if points and helper_ids:
+            self._award(guild_id, helper_ids, points, 'ticket', channel_id, actor_id)
+        return True
+
+    async def add_ticket_helper(self, channel_id: int, user_id: int):
+        ticket = self._tickets.get(channel_id)
+        if ticket is not None and user_id not in ticket['helpers']:
+            ticket['helpers'].append(user_id)
+
+    async def remove_ticket_helper(self, channel_id: int, user_id: int):
+        ticket = self._tickets.get(channel_id)
+        if ticket is not None and user_id in ticket['helpers']:
+            ticket['helpers'].remove(user_id)
+
+# Every public method is timed for /metrics
+time_methods(MemoryStorage)
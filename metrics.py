@@ -0,0 +1,204 @@
+# metrics.py
+import bisect
+import functools
+import inspect
+import logging
+import math
+import time
+from contextlib import contextmanager
+from discord import app_commands, InteractionType
+import timing
+
+# Seconds; covers a fast DB read up to the 3 s interaction deadline and beyond
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def _format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _format_labels(names, values, extra=()):
+    pairs = [(name, str(value)) for name, value in zip(names, values)] + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in list(self._values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value: float, *labels):
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    @contextmanager
+    def timer(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self):
+        for labels, state in list(self._values.items()):
+            state = list(state)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, labels, [("le", _format_value(bound))]), cumulative
+            yield f"{self.name}_count", _format_labels(self.labelnames, labels), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labels), state[-1]
+
+class Callback:
+    """Value read from live state at scrape time; `func` returns a number or an iterable of (labels, value)"""
+
+    def __init__(self, name: str, documentation: str, func, labelnames=(), type="gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.func = func
+        self.labelnames = tuple(labelnames)
+        self.type = type
+
+    def samples(self):
+        values = self.func()
+        if not self.labelnames:
+            values = [((), values)]
+        for labels, value in values:
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        # Re-registering replaces, so reloading an extension does not duplicate series
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Text exposition format 0.0.4"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            try:
+                for name, labels, value in metric.samples():
+                    lines.append(f"{name}{labels} {_format_value(value)}")
+            except Exception:
+                logging.getLogger(__name__).exception(f"❌ Failed to collect metric {metric.name}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+COMMAND_INVOCATIONS = REGISTRY.register(Counter(
+    "bot_command_invocations_total", "Slash command invocations by outcome", ("command", "status")))
+COMMAND_DURATION = REGISTRY.register(Histogram(
+    "bot_command_duration_seconds", "Slash command handling time", ("command",)))
+DB_DURATION = REGISTRY.register(Histogram(
+    "bot_db_query_duration_seconds", "DatabaseManager call time by method", ("method",)))
+TICKET_CREATE_DURATION = REGISTRY.register(Histogram(
+    "bot_ticket_create_duration_seconds", "Time from ticket modal submit to the channel being ready"))
+HTTP_RATE_LIMITS = REGISTRY.register(Counter(
+    "discord_http_429_total", "Discord HTTP 429 responses by rate limit scope", ("scope",)))
+
+# X-RateLimit-Scope -> scope label; "user" is the bot's own per-route bucket
+RATE_LIMIT_SCOPES = {"user": "route", "shared": "shared", "global": "global"}
+
+def count_rate_limit(headers):
+    """Count one 429 response under the scope Discord reports in its headers"""
+    if headers.get("X-RateLimit-Global", "").lower() == "true":
+        scope = "global"
+    else:
+        # No scope header: the 429 came from Cloudflare rather than Discord's rate limiter
+        scope = RATE_LIMIT_SCOPES.get(headers.get("X-RateLimit-Scope", "").lower(), "unknown")
+    HTTP_RATE_LIMITS.inc(scope)
+
+def time_methods(cls, histogram=DB_DURATION):
+    """Wrap every public coroutine method of cls so each call is observed under its method name"""
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(func):
+            continue
+
+        def wrap(func, name=name):
+            @functools.wraps(func)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    with timing.db_call():
+                        return await func(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start, name)
+            return timed
+
+        setattr(cls, name, wrap(func))
+    return cls
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """CommandTree that counts and times every slash command it runs, split into DB/REST/local time"""
+
+    async def _call(self, interaction):
+        if interaction.type is InteractionType.autocomplete:
+            return await super()._call(interaction)
+        start = time.perf_counter()
+        failed = True
+        with timing.track() as command_timing:
+            try:
+                await super()._call(interaction)
+                failed = interaction.command_failed
+            finally:
+                command = interaction.command
+                name = command.qualified_name if command else "unknown"
+                command_timing.name = f"/{name}"
+                COMMAND_INVOCATIONS.inc(name, "error" if failed else "ok")
+                COMMAND_DURATION.observe(time.perf_counter() - start, name)
+
+def install(bot):
+    """Register the gauges that read live bot state; 429s are counted by timing.http_trace"""
+    REGISTRY.register(Callback(
+        "discord_gateway_latency_seconds", "Heartbeat latency of each gateway shard",
+        lambda: [((shard_id,), latency) for shard_id, latency in bot.latencies], ("shard_id",)))
+    REGISTRY.register(Callback(
+        "discord_shard_ready", "1 while the shard is connected and ready",
+        lambda: [((shard_id,), int(entry["state"] == "ready")) for shard_id, entry in bot.shard_health.snapshot(bot).items()],
+        ("shard_id",)))
+
+    def open_tickets():
+        ticket_cog = bot.get_cog("TicketCommandsCog")
+        return [((guild_id,), count) for guild_id, count in ticket_cog.tickets.count_by_guild().items()] if ticket_cog else []
+
+    REGISTRY.register(Callback("bot_open_tickets", "Open tickets per guild", open_tickets, ("guild_id",)))
+    REGISTRY.register(Callback(
+        "bot_config_cache_hits_total", "server_config cache hits", lambda: bot.db.config_cache_hits, type="counter"))
+    REGISTRY.register(Callback(
+        "bot_config_cache_misses_total", "server_config cache misses", lambda: bot.db.config_cache_misses, type="counter"))
+    REGISTRY.register(Callback(
+        "bot_config_cache_hit_ratio", "server_config cache hit rate", lambda: bot.db.config_cache_stats()["hit_rate"]))
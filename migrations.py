@@ -0,0 +1,247 @@
+# migrations.py
+"""Ordered schema migrations; PRAGMA user_version holds the number of the last one applied.
+
+Append new migrations to the end and never edit one that has shipped. Every step
+must be idempotent: databases created before migrations existed start at
+version 0 with some of these tables already in place.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def _add_column(db, table: str, column: str, declaration: str):
+    async with db.execute(f'PRAGMA table_info({table})') as cursor:
+        columns = {row[1] for row in await cursor.fetchall()}
+    if column not in columns:
+        await db.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+
+async def _add_message_id(db):
+    await _add_column(db, 'active_tickets', 'message_id', 'INTEGER')
+
+async def _migrate_helper_csv(db):
+    """Move helpers stored as 'id,id,...' in active_tickets into ticket_helpers rows"""
+    async with db.execute("SELECT channel_id, helpers FROM active_tickets WHERE helpers IS NOT NULL AND helpers != ''") as cursor:
+        rows = await cursor.fetchall()
+    if not rows:
+        return
+    await db.executemany(
+        'INSERT OR IGNORE INTO ticket_helpers (channel_id, user_id, slot) VALUES (?, ?, ?)',
+        [(channel_id, int(user_id), slot)
+         for channel_id, helpers in rows
+         for slot, user_id in enumerate(h for h in helpers.split(',') if h)]
+    )
+    await db.execute("UPDATE active_tickets SET helpers = NULL WHERE helpers IS NOT NULL")
+
+async def _seed_points_snapshot(db):
+    """Snapshot the totals that predate the ledger at ledger id 0, so replaying the ledger reproduces them"""
+    async with db.execute('SELECT EXISTS (SELECT 1 FROM points_ledger) OR EXISTS (SELECT 1 FROM ledger_snapshots)') as cursor:
+        if (await cursor.fetchone())[0]:
+            return
+    await db.execute('INSERT INTO points_snapshots (guild_id, user_id, points) SELECT guild_id, user_id, points FROM user_points WHERE points != 0')
+    await db.execute("INSERT INTO ledger_snapshots (ledger_id, taken_at) VALUES (0, CAST(strftime('%s', 'now') AS INTEGER))")
+
+async def _version_points_snapshots(db):
+    """Key points_snapshots by the ledger id each copy was taken at, so a new copy can be written beside the current one"""
+    async with db.execute('PRAGMA table_info(points_snapshots)') as cursor:
+        if 'ledger_id' in {row[1] for row in await cursor.fetchall()}:
+            return
+    await db.execute('''
+        CREATE TABLE points_snapshots_versioned (
+            ledger_id INTEGER,
+            guild_id INTEGER,
+            user_id INTEGER,
+            points INTEGER NOT NULL,
+            PRIMARY KEY (ledger_id, guild_id, user_id)
+        )
+    ''')
+    await db.execute('''
+        INSERT INTO points_snapshots_versioned (ledger_id, guild_id, user_id, points)
+        SELECT (SELECT COALESCE(MAX(ledger_id), 0) FROM ledger_snapshots), guild_id, user_id, points FROM points_snapshots
+    ''')
+    await db.execute('DROP TABLE points_snapshots')
+    await db.execute('ALTER TABLE points_snapshots_versioned RENAME TO points_snapshots')
+
+# (version, description, steps); a step is an SQL statement or an async callable taking the connection
+MIGRATIONS = [
+    (1, "base tables", (
+        '''
+        CREATE TABLE IF NOT EXISTS server_config (
+            guild_id INTEGER PRIMARY KEY,
+            admin_role_id INTEGER,
+            staff_role_id INTEGER,
+            helper_role_id INTEGER,
+            viewer_role_id INTEGER,
+            blocked_role_id INTEGER,
+            reward_role_id INTEGER,
+            ticket_category_id INTEGER,
+            transcript_channel_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS point_values (
+            guild_id INTEGER,
+            ticket_type TEXT,
+            points INTEGER,
+            PRIMARY KEY (guild_id, ticket_type)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS helper_slots (
+            guild_id INTEGER,
+            ticket_type TEXT,
+            slots INTEGER,
+            PRIMARY KEY (guild_id, ticket_type)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS custom_commands (
+            guild_id INTEGER,
+            command_name TEXT,
+            content TEXT NOT NULL,
+            image_url TEXT,
+            PRIMARY KEY (guild_id, command_name)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_points (
+            guild_id INTEGER,
+            user_id INTEGER,
+            points INTEGER DEFAULT 0,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS active_tickets (
+            guild_id INTEGER,
+            channel_id INTEGER PRIMARY KEY,
+            creator_id INTEGER,
+            ticket_type TEXT,
+            ticket_number INTEGER,
+            helpers TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    )),
+    (2, "active_tickets.message_id", (_add_message_id,)),
+    (3, "ticket_sequences", (
+        '''
+        CREATE TABLE IF NOT EXISTS ticket_sequences (
+            guild_id INTEGER,
+            ticket_type TEXT,
+            last_number INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, ticket_type)
+        )
+        ''',
+    )),
+    # Replaces the comma-joined active_tickets.helpers column
+    (4, "ticket_helpers", (
+        '''
+        CREATE TABLE IF NOT EXISTS ticket_helpers (
+            channel_id INTEGER,
+            user_id INTEGER,
+            slot INTEGER NOT NULL,
+            joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (channel_id, user_id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_ticket_helpers_user ON ticket_helpers (user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_active_tickets_guild_type ON active_tickets (guild_id, ticket_type)',
+        'CREATE INDEX IF NOT EXISTS idx_active_tickets_creator ON active_tickets (creator_id)',
+        _migrate_helper_csv,
+    )),
+    # Every change to user_points, append-only, plus snapshots that replay starts from
+    (5, "points_ledger", (
+        '''
+        CREATE TABLE IF NOT EXISTS points_ledger (
+            id INTEGER PRIMARY KEY,
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            delta INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            channel_id INTEGER,
+            actor_id INTEGER,
+            created_at INTEGER NOT NULL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_points_ledger_user ON points_ledger (guild_id, user_id, id)',
+        'CREATE INDEX IF NOT EXISTS idx_points_ledger_guild ON points_ledger (guild_id, id)',
+        '''
+        CREATE TABLE IF NOT EXISTS ledger_snapshots (
+            ledger_id INTEGER PRIMARY KEY,
+            taken_at INTEGER NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS points_snapshots (
+            guild_id INTEGER,
+            user_id INTEGER,
+            points INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        ''',
+        _seed_points_snapshot,
+    )),
+    # Points awarded per user per week/month/season bucket
+    (6, "points_rollups", (
+        '''
+        CREATE TABLE IF NOT EXISTS points_rollups (
+            guild_id INTEGER,
+            period TEXT,
+            bucket TEXT,
+            user_id INTEGER,
+            points INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, period, bucket, user_id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_points_rollups_rank ON points_rollups (guild_id, period, bucket, points DESC, user_id)',
+    )),
+    # Process-wide key/value state, e.g. the hash of the last synced command tree
+    (7, "bot_meta", (
+        '''
+        CREATE TABLE IF NOT EXISTS bot_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+        ''',
+    )),
+    # All-time leaderboard reads and rank counts walk this instead of sorting the guild
+    (8, "user_points rank index", (
+        'CREATE INDEX IF NOT EXISTS idx_user_points_rank ON user_points (guild_id, points DESC, user_id)',
+    )),
+    # Helper lookups start from the helper's rows and read channel ids from the index alone
+    (9, "ticket_helpers user index", (
+        'CREATE INDEX IF NOT EXISTS idx_ticket_helpers_user_channel ON ticket_helpers (user_id, channel_id)',
+        'DROP INDEX IF EXISTS idx_ticket_helpers_user',
+    )),
+    # Snapshots are copied in batches beside the current one and published by their ledger_snapshots row
+    (10, "versioned points_snapshots", (_version_points_snapshots,)),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+async def migrate(db) -> tuple:
+    """Apply pending migrations on `db`, which must already be inside a write transaction.
+
+    Returns (version before, version after).
+    """
+    async with db.execute('PRAGMA user_version') as cursor:
+        current = (await cursor.fetchone())[0]
+    if current > SCHEMA_VERSION:
+        logger.warning(f"⚠️ Database schema is version {current}, newer than this code ({SCHEMA_VERSION}); not migrating")
+        return current, current
+    for version, description, steps in MIGRATIONS:
+        if version <= current:
+            continue
+        for step in steps:
+            if callable(step):
+                await step(db)
+            else:
+                await db.execute(step)
+        logger.info(f"🗄️ Applied migration {version}: {description}")
+    if current < SCHEMA_VERSION:
+        # Refresh planner statistics so new indexes get used
+        await db.execute('ANALYZE')
+        await db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    return current, SCHEMA_VERSION
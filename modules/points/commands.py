@@ -1,6 +1,16 @@
 import discord
 from discord import app_commands, Embed, Color, ui
 from discord.ext import commands
+from timing import timed
+
+# Leaderboard windows offered on /leaderboard and /myrank
+WINDOW_CHOICES = [
+    app_commands.Choice(name="All-time", value="all"),
+    app_commands.Choice(name="This week", value="week"),
+    app_commands.Choice(name="This month", value="month"),
+    app_commands.Choice(name="This season", value="season"),
+]
+WINDOW_LABELS = {choice.value: choice.name for choice in WINDOW_CHOICES}
 
 class PointsCog(commands.Cog):
     def __init__(self, bot):
@@ -14,19 +24,20 @@ class PointsCog(commands.Cog):
         await interaction.response.send_message(f"💰 {member.display_name} has {points} points.")
 
     @app_commands.command(name="leaderboard", description="Show the top 10 users on the leaderboard")
-    async def leaderboard(self, interaction: discord.Interaction):
-        all_points = await self.bot.db.get_all_user_points(interaction.guild.id)
-        if not all_points:
+    @app_commands.describe(window="Time window to rank by (default: all-time)")
+    @app_commands.choices(window=WINDOW_CHOICES)
+    async def leaderboard(self, interaction: discord.Interaction, window: str = "all"):
+        top_points = await self.bot.db.get_top_points(interaction.guild.id, 10, window=window)
+        if not top_points:
             await interaction.response.send_message("No points recorded yet.")
             return
 
-        sorted_points = sorted(all_points.items(), key=lambda x: x[1], reverse=True)
         embed = Embed(
-            title="🏆 Leaderboard",
+            title=f"🏆 Leaderboard ({WINDOW_LABELS[window]})",
             description="Top 10 helpers by points",
             color=Color.gold()
         )
-        for i, (user_id, points) in enumerate(sorted_points[:10], start=1):
+        for i, (user_id, points) in enumerate(top_points, start=1):
             member = interaction.guild.get_member(user_id)
             name = member.display_name if member else f"User ID {user_id}"
             embed.add_field(
@@ -37,20 +48,22 @@ class PointsCog(commands.Cog):
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="myrank", description="Show your current rank in the leaderboard")
-    async def myrank(self, interaction: discord.Interaction):
-        all_points = await self.bot.db.get_all_user_points(interaction.guild.id)
-        sorted_points = sorted(all_points.items(), key=lambda x: x[1], reverse=True)
-        for i, (user_id, points) in enumerate(sorted_points, start=1):
-            if user_id == interaction.user.id:
-                await interaction.response.send_message(f"📊 {interaction.user.display_name}, your rank is #{i} with {points} points.")
-                return
-        await interaction.response.send_message(f"📊 {interaction.user.display_name}, you have 0 points and are not on the leaderboard.")
+    @app_commands.describe(window="Time window to rank by (default: all-time)")
+    @app_commands.choices(window=WINDOW_CHOICES)
+    async def myrank(self, interaction: discord.Interaction, window: str = "all"):
+        entry = await self.bot.db.get_user_rank(interaction.guild.id, interaction.user.id, window=window)
+        period = WINDOW_LABELS[window].lower()
+        if entry:
+            rank, points = entry
+            await interaction.response.send_message(f"📊 {interaction.user.display_name}, your {period} rank is #{rank} with {points} points.")
+            return
+        await interaction.response.send_message(f"📊 {interaction.user.display_name}, you have 0 {period} points and are not on the leaderboard.")
 
     @app_commands.command(name="addpoints", description="Add points to a user (admin only)")
     @app_commands.describe(member="The user to add points to", amount="Amount of points to add")
     @app_commands.default_permissions(administrator=True)
     async def addpoints(self, interaction: discord.Interaction, member: discord.Member, amount: int):
-        await self.bot.db.add_user_points(interaction.guild.id, member.id, amount)
+        await self.bot.db.add_user_points(interaction.guild.id, member.id, amount, actor_id=interaction.user.id)
         await interaction.response.send_message(f"✅ Added {amount} points to {member.display_name}.")
 
     @app_commands.command(name="removepoints", description="Remove points from a user (admin only)")
@@ -59,21 +72,21 @@ class PointsCog(commands.Cog):
     async def removepoints(self, interaction: discord.Interaction, member: discord.Member, amount: int):
         current = await self.bot.db.get_user_points(interaction.guild.id, member.id)
         new_total = max(current - amount, 0)
-        await self.bot.db.set_user_points(interaction.guild.id, member.id, new_total)
+        await self.bot.db.set_user_points(interaction.guild.id, member.id, new_total, actor_id=interaction.user.id)
         await interaction.response.send_message(f"✅ Removed {amount} points from {member.display_name}. New total: {new_total}")
 
     @app_commands.command(name="setpoints", description="Set points for a user (admin only)")
     @app_commands.describe(member="The user to set points for", amount="Amount of points to set")
     @app_commands.default_permissions(administrator=True)
     async def setpoints(self, interaction: discord.Interaction, member: discord.Member, amount: int):
-        await self.bot.db.set_user_points(interaction.guild.id, member.id, amount)
+        await self.bot.db.set_user_points(interaction.guild.id, member.id, amount, actor_id=interaction.user.id)
         await interaction.response.send_message(f"✅ Set {member.display_name}'s points to {amount}.")
 
     @app_commands.command(name="removeuser", description="Remove a specific user from the leaderboard")
     @app_commands.describe(member="The user to remove from leaderboard")
     @app_commands.default_permissions(administrator=True)
     async def removeuser(self, interaction: discord.Interaction, member: discord.Member):
-        await self.bot.db.remove_user(interaction.guild.id, member.id)
+        await self.bot.db.remove_user(interaction.guild.id, member.id, actor_id=interaction.user.id)
         await interaction.response.send_message(f"✅ {member.display_name} has been removed from the leaderboard.")
 
     @app_commands.command(name="resetlb", description="Reset the leaderboard with confirmation")
@@ -85,8 +98,9 @@ class PointsCog(commands.Cog):
                 self.value = None
 
             @ui.button(label="Confirm Reset", style=discord.ButtonStyle.danger)
+            @timed("button:resetlb-confirm")
             async def confirm(self, button_interaction: discord.Interaction, button: ui.Button):
-                await self.bot.db.clear_all_points(interaction.guild.id)
+                await button_interaction.client.db.clear_all_points(interaction.guild.id, actor_id=button_interaction.user.id)
                 await button_interaction.response.edit_message(content="✅ Leaderboard has been reset!", view=None)
                 self.value = True
                 self.stop()
@@ -1,20 +1,85 @@
 import discord
+from discord import app_commands, ui, Embed, Color
 from discord.ext import commands
-from database import DatabaseManager
+from timing import timed
 
-db = DatabaseManager()
+HISTORY_PAGE_SIZE = 10
+
+REASON_LABELS = {
+    "ticket": "🎫 Ticket",
+    "add": "➕ Added",
+    "set": "✏️ Set",
+    "reset": "🔄 Reset",
+    "remove": "🗑️ Removed",
+}
+
+class HistoryView(ui.View):
+    """Pages through a user's points ledger, newest first; every page is one keyset read on the ledger index"""
+
+    def __init__(self, db, guild_id: int, member: discord.Member, viewer_id: int):
+        super().__init__(timeout=120)
+        self.db = db
+        self.guild_id = guild_id
+        self.member = member
+        self.viewer_id = viewer_id
+        # before_id of every page shown so far; the last one is the current page
+        self.cursors = [None]
+        self.rows = []
+        self.has_older = False
+
+    async def load(self):
+        rows = await self.db.get_points_history(self.guild_id, self.member.id, before_id=self.cursors[-1], limit=HISTORY_PAGE_SIZE + 1)
+        self.has_older = len(rows) > HISTORY_PAGE_SIZE
+        self.rows = rows[:HISTORY_PAGE_SIZE]
+        self.newer.disabled = len(self.cursors) == 1
+        self.older.disabled = not self.has_older
+
+    def build_embed(self):
+        embed = Embed(title=f"📜 Points History: {self.member.display_name}", color=Color.blurple())
+        if not self.rows:
+            embed.description = "No points history yet."
+            return embed
+        lines = []
+        for row in self.rows:
+            label = REASON_LABELS.get(row["reason"], row["reason"])
+            line = f"<t:{row['created_at']}:R> {label} **{row['delta']:+d}**"
+            if row["channel_id"]:
+                line += f" · ticket <#{row['channel_id']}>"
+            if row["actor_id"]:
+                line += f" · by <@{row['actor_id']}>"
+            lines.append(line)
+        embed.description = "\n".join(lines)
+        embed.set_footer(text=f"Page {len(self.cursors)}")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        return interaction.user.id == self.viewer_id
+
+    @ui.button(label="Newer", style=discord.ButtonStyle.secondary, emoji="◀️")
+    @timed("button:history-newer")
+    async def newer(self, interaction: discord.Interaction, button: ui.Button):
+        self.cursors.pop()
+        await self.load()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @ui.button(label="Older", style=discord.ButtonStyle.secondary, emoji="▶️")
+    @timed("button:history-older")
+    async def older(self, interaction: discord.Interaction, button: ui.Button):
+        self.cursors.append(self.rows[-1]["id"])
+        await self.load()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
 
 class PointsExtraCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.command(name="history")
-    async def history_command(self, ctx, member: discord.Member = None):
-        """Show a user's points history (current points as placeholder)"""
-        member = member or ctx.author
-        points = await db.get_user_points(ctx.guild.id, member.id)
-        # TODO: Extend DB to track full history
-        await ctx.send(f"📜 {member.display_name} has {points} points (history tracking not yet implemented).")
+    @app_commands.command(name="history", description="Show a user's points history")
+    @app_commands.describe(member="The user to show history for (optional)")
+    async def history_command(self, interaction: discord.Interaction, member: discord.Member = None):
+        member = member or interaction.user
+        view = HistoryView(self.bot.db, interaction.guild.id, member, interaction.user.id)
+        await view.load()
+        await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
 
     @commands.command(name="pointsinfo")
     async def pointsinfo_command(self, ctx):
@@ -25,6 +90,7 @@ class PointsExtraCog(commands.Cog):
             "- Admins can add, remove, or set points.\n"
             "- Check your points with `!points`.\n"
             "- See top users with `!leaderboard` or `!lb`.\n"
+            "- See where your points came from with `/history`.\n"
             "- Reset the leaderboard with `!resetlb` (admin only).\n"
             "- Remove users from leaderboard with `!removeuser` (admin only)."
         )
@@ -32,4 +98,4 @@ class PointsExtraCog(commands.Cog):
 
 # -------------------- LOAD COG --------------------
 async def setup(bot):
-    await bot.add_cog(PointsExtraCog(bot))
\ No newline at end of file
+    await bot.add_cog(PointsExtraCog(bot))
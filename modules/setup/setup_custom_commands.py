@@ -3,9 +3,6 @@ import discord
 from discord.ext import commands
 from discord.ui import Modal, TextInput, View, Button
 from discord import Interaction
-from database import DatabaseManager
-
-db = DatabaseManager()
 
 class CustomCommandModal(Modal):
     def __init__(self, command_name: str, existing_content: str = "", existing_image: str = ""):
@@ -34,7 +31,7 @@ class CustomCommandModal(Modal):
         content = self.content_input.value
         image_url = getattr(self, 'image_input', None)
         image_url = image_url.value if image_url else ""
-        await db.set_custom_command(interaction.guild.id, self.command_name, content, image_url)
+        await interaction.client.db.set_custom_command(interaction.guild.id, self.command_name, content, image_url)
         await interaction.response.send_message(f"✅ Custom command `!{self.command_name}` configured!", ephemeral=True)
 
 class CustomCommandView(View):
@@ -43,19 +40,19 @@ class CustomCommandView(View):
 
     @discord.ui.button(label="Setup rrules", style=discord.ButtonStyle.primary, emoji="📜")
     async def setup_rrules(self, interaction: discord.Interaction, button: discord.ui.Button):
-        existing = await db.get_custom_command(interaction.guild.id, "rrules")
+        existing = await interaction.client.db.get_custom_command(interaction.guild.id, "rrules")
         content = existing['content'] if existing else ""
         await interaction.response.send_modal(CustomCommandModal("rrules", content))
 
     @discord.ui.button(label="Setup hrules", style=discord.ButtonStyle.primary, emoji="📋")
     async def setup_hrules(self, interaction: discord.Interaction, button: discord.ui.Button):
-        existing = await db.get_custom_command(interaction.guild.id, "hrules")
+        existing = await interaction.client.db.get_custom_command(interaction.guild.id, "hrules")
         content = existing['content'] if existing else ""
         await interaction.response.send_modal(CustomCommandModal("hrules", content))
 
     @discord.ui.button(label="Setup proof", style=discord.ButtonStyle.primary, emoji="📸")
     async def setup_proof(self, interaction: discord.Interaction, button: discord.ui.Button):
-        existing = await db.get_custom_command(interaction.guild.id, "proof")
+        existing = await interaction.client.db.get_custom_command(interaction.guild.id, "proof")
         content = existing['content'] if existing else ""
         image = existing['image_url'] if existing else ""
         await interaction.response.send_modal(CustomCommandModal("proof", content, image))
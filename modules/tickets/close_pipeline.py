@@ -0,0 +1,89 @@
+# modules/tickets/close_pipeline.py
+import asyncio
+import logging
+import discord
+from config import TRANSCRIPT_COMPRESS
+from modules.tickets.transcript import export_transcript
+
+logger = logging.getLogger(__name__)
+
+async def save_transcript(db, ticket, channel: discord.TextChannel, closed_by: discord.Member):
+    """Save transcript of the ticket"""
+    config = await db.get_server_config(channel.guild.id)
+    transcript_channel_id = config.get("transcript_channel_id") if config else None
+
+    if not transcript_channel_id:
+        return  # No transcript channel configured
+
+    transcript_channel = channel.guild.get_channel(transcript_channel_id)
+    if not transcript_channel:
+        return
+
+    # Stream messages into temp-file parts sized for the upload limit
+    transcript_files = await export_transcript(channel, compress=TRANSCRIPT_COMPRESS)
+
+    # Send to transcript channel
+    embed = discord.Embed(
+        title=f"📄 Ticket Transcript: {ticket.category}",
+        color=discord.Color.red()
+    )
+    embed.add_field(name="Ticket Owner", value=f"<@{ticket.owner_id}>", inline=True)
+    embed.add_field(name="Closed By", value=closed_by.mention, inline=True)
+    embed.add_field(name="Channel", value=f"#{channel.name}", inline=True)
+    embed.add_field(name="Helpers", value=f"{len(ticket.helpers)} helpers", inline=True)
+    if len(transcript_files) > 1:
+        embed.add_field(name="Parts", value=str(len(transcript_files)), inline=True)
+
+    # One part per message so each upload stays under the limit
+    await transcript_channel.send(embed=embed, file=transcript_files[0])
+    for transcript_file in transcript_files[1:]:
+        await transcript_channel.send(file=transcript_file)
+
+class ClosePipeline:
+    """Exports transcripts and deletes channels of closed tickets in the background, `concurrency` at a time across all guilds"""
+
+    def __init__(self, db, concurrency: int = 4, delete_delay: float = 5):
+        self.db = db
+        self.delete_delay = delete_delay
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks = set()
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def submit(self, ticket, channel: discord.TextChannel, closed_by: discord.Member):
+        """Queue the cleanup of a ticket whose close is already committed"""
+        task = asyncio.create_task(self._finish(ticket, channel, closed_by))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _finish(self, ticket, channel: discord.TextChannel, closed_by: discord.Member):
+        loop = asyncio.get_running_loop()
+        delete_at = loop.time() + self.delete_delay
+
+        async with self._semaphore:
+            try:
+                await save_transcript(self.db, ticket, channel, closed_by)
+            except Exception:
+                # The close is already committed; losing the transcript must not leave the channel behind
+                logger.exception(f"❌ Transcript export failed for ticket {channel.id}")
+
+        # Leave the close message up for delete_delay seconds, without holding a slot while waiting
+        await asyncio.sleep(max(0, delete_at - loop.time()))
+        async with self._semaphore:
+            try:
+                await channel.delete(reason=f"Ticket closed by {closed_by.display_name}")
+            except discord.NotFound:
+                pass  # Deleted by hand in the meantime
+            except discord.HTTPException:
+                logger.exception(f"❌ Could not delete ticket channel {channel.id}")
+
+    async def drain(self, timeout: float = 30):
+        """Wait for queued closes to finish, cancelling whatever is still running after `timeout` seconds"""
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"⚠️ Cancelled {len(pending)} ticket closes still running at shutdown")
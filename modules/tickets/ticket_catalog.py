@@ -0,0 +1,142 @@
+# modules/tickets/ticket_catalog.py
+import re
+import discord
+
+# Defaults for guilds with no rows in point_values / helper_slots
+CATEGORY_POINTS = {
+    "Ultra Speaker Express": 8,
+    "Ultra Gramiel Express": 7,
+    "4-Man Ultra Daily Express": 4,
+    "7-Man Ultra Daily Express": 7,
+    "Ultra Weekly Express": 12,
+    "Grim Express": 10,
+    "Daily Temple Express": 6
+}
+
+CATEGORY_SLOTS = {
+    "Ultra Speaker Express": 3,
+    "Ultra Gramiel Express": 3,
+    "4-Man Ultra Daily Express": 3,
+    "7-Man Ultra Daily Express": 6,
+    "Ultra Weekly Express": 3,
+    "Grim Express": 6,
+    "Daily Temple Express": 3
+}
+
+# Channel name prefix for each category; other types get a slug of their name
+CATEGORY_CHANNEL_NAMES = {
+    "Ultra Speaker Express": "ultra-speaker",
+    "Ultra Gramiel Express": "ultra-gramiel",
+    "4-Man Ultra Daily Express": "4-man-daily",
+    "7-Man Ultra Daily Express": "7-man-daily",
+    "Ultra Weekly Express": "weekly-ultra",
+    "Grim Express": "grimchallenge",
+    "Daily Temple Express": "templeshrine"
+}
+
+# A select menu holds at most 25 options and an embed at most 25 fields
+MAX_TICKET_TYPES = 25
+
+# Modal titles are capped at 45 characters and the ticket form's is "<name> Ticket Form"
+MODAL_TITLE_SUFFIX = " Ticket Form"
+MAX_TYPE_NAME = 45 - len(MODAL_TITLE_SUFFIX)
+
+def channel_prefix(name: str) -> str:
+    return CATEGORY_CHANNEL_NAMES.get(name) or re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "ticket"
+
+class TicketType:
+    __slots__ = ("name", "points", "slots", "channel_prefix")
+
+    def __init__(self, name: str, points: int, slots: int):
+        self.name = name
+        self.points = points
+        self.slots = slots
+        self.channel_prefix = channel_prefix(name)
+
+class TicketCatalog:
+    """One guild's ticket types with everything derived from them, compiled once; never mutated after construction"""
+    __slots__ = ("types", "_by_name", "select_options", "panel_fields", "panel_services", "_embeds", "_views")
+
+    def __init__(self, point_values: dict = None, helper_slots: dict = None):
+        point_values = {**CATEGORY_POINTS, **(point_values or {})}
+        helper_slots = {**CATEGORY_SLOTS, **(helper_slots or {})}
+        names = dict.fromkeys([*point_values, *helper_slots])
+        self.types = tuple(TicketType(name, point_values.get(name, 0), helper_slots.get(name, 0)) for name in names)
+        self._by_name = {ticket_type.name: ticket_type for ticket_type in self.types}
+        self.select_options = tuple(
+            discord.SelectOption(label=ticket_type.name, value=ticket_type.name, emoji="🎫")
+            for ticket_type in self.types[:MAX_TICKET_TYPES]
+        )
+        self.panel_fields = tuple(
+            (f"🎯 {ticket_type.name}", f"Points: {ticket_type.points} | Helpers: {ticket_type.slots}")
+            for ticket_type in self.types[:MAX_TICKET_TYPES]
+        )
+        self.panel_services = "\n".join(f"- {ticket_type.name} — {ticket_type.points} points" for ticket_type in self.types)
+        # Rendered panels, keyed by name; they go away with the catalog when the guild's types change
+        self._embeds = {}
+        self._views = {}
+
+    def __contains__(self, name: str):
+        return name in self._by_name
+
+    def get(self, name: str):
+        return self._by_name.get(name)
+
+    def embed(self, key: str, build) -> discord.Embed:
+        """The embed build(catalog) returns, serialized once per catalog; the result shares the cached payload, so don't mutate it"""
+        payload = self._embeds.get(key)
+        if payload is None:
+            payload = self._embeds[key] = build(self).to_dict()
+        return discord.Embed.from_dict(payload)
+
+    def view(self, key: str, build) -> discord.ui.View:
+        """The view build(catalog) returns, shared by every message sent from this catalog; call from the event loop"""
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = build(self)
+        return view
+
+    def points(self, name: str) -> int:
+        ticket_type = self._by_name.get(name)
+        return ticket_type.points if ticket_type else 0
+
+    def slots(self, name: str) -> int:
+        ticket_type = self._by_name.get(name)
+        return ticket_type.slots if ticket_type else 0
+
+class TicketCatalogs:
+    """Compiled catalog per guild: read from the DB on first use, rebuilt only after an admin changes it"""
+
+    def __init__(self, db):
+        self.db = db
+        self._catalogs = {}
+        self._generation = 0
+
+    async def get(self, guild_id: int) -> TicketCatalog:
+        catalog = self._catalogs.get(guild_id)
+        if catalog is not None:
+            return catalog
+        generation = self._generation
+        catalog = TicketCatalog(await self.db.get_point_values(guild_id), await self.db.get_helper_slots(guild_id))
+        # Skip caching if an update landed while this load was in flight
+        if generation == self._generation:
+            catalog = self._catalogs.setdefault(guild_id, catalog)
+        return catalog
+
+    def invalidate(self, guild_id: int):
+        self._generation += 1
+        self._catalogs.pop(guild_id, None)
+
+    async def update(self, guild_id: int, name: str, points: int = None, slots: int = None) -> TicketCatalog:
+        """Set the points and/or slots of a ticket type (adding it if new) and rebuild the guild's catalog"""
+        catalog = await self.get(guild_id)
+        point_values = {ticket_type.name: ticket_type.points for ticket_type in catalog.types}
+        helper_slots = {ticket_type.name: ticket_type.slots for ticket_type in catalog.types}
+        point_values[name] = points if points is not None else point_values.get(name, 0)
+        helper_slots[name] = slots if slots is not None else helper_slots.get(name, 1)
+        try:
+            await self.db.set_point_values(guild_id, point_values)
+            await self.db.set_helper_slots(guild_id, helper_slots)
+        finally:
+            self.invalidate(guild_id)
+        return await self.get(guild_id)
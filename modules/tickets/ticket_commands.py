@@ -1,59 +1,40 @@
+import asyncio
 import discord
 from discord.ext import commands
-from discord import Embed
-from database import DatabaseManager
-
-# Initialize database
-db = DatabaseManager()
-
-# Points for each ticket category
-CATEGORY_POINTS = {
-    "Ultra Speaker Express": 8,
-    "Ultra Gramiel Express": 7,
-    "4-Man Ultra Daily Express": 4,
-    "7-Man Ultra Daily Express": 7,
-    "Ultra Weekly Express": 12,
-    "Grim Express": 10,
-    "Daily Temple Express": 6
-}
-
-# Number of helper slots for each ticket category
-CATEGORY_SLOTS = {
-    "Ultra Speaker Express": 3,
-    "Ultra Gramiel Express": 3,
-    "4-Man Ultra Daily Express": 3,
-    "7-Man Ultra Daily Express": 6,
-    "Ultra Weekly Express": 3,
-    "Grim Express": 6,
-    "Daily Temple Express": 3
-}
-
-# Channel name prefix for each category
-CATEGORY_CHANNEL_NAMES = {
-    "Ultra Speaker Express": "ultra-speaker",
-    "Ultra Gramiel Express": "ultra-gramiel",
-    "4-Man Ultra Daily Express": "4-man-daily",
-    "7-Man Ultra Daily Express": "7-man-daily",
-    "Ultra Weekly Express": "weekly-ultra",
-    "Grim Express": "grimchallenge",
-    "Daily Temple Express": "templeshrine"
-}
+from discord import app_commands, Embed
+from modules.tickets.ticket_catalog import MAX_TICKET_TYPES, MAX_TYPE_NAME, TicketCatalogs
+from modules.tickets.ticket_state import TicketRecord, TicketRegistry
+from metrics import TICKET_CREATE_DURATION
+from timing import timed
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How far into a legacy ticket channel to look for the ticket message
+LEGACY_MESSAGE_SEARCH_LIMIT = 10
 
 class TicketSelectView(discord.ui.View):
-    def __init__(self):
+    def __init__(self, catalog):
         super().__init__(timeout=None)
-        
-        options = [
-            discord.SelectOption(label=category, value=category, emoji="🎫") 
-            for category in CATEGORY_POINTS.keys()
-        ]
-        
-        self.add_item(TicketSelect(options))
+        self.add_item(TicketSelect(list(catalog.select_options)))
+
+def create_panel_embed(catalog):
+    embed = Embed(
+        title="🎫 Create a Ticket",
+        description="Select the type of ticket you want to create:",
+        color=discord.Color.blue()
+    )
+    
+    # Add information about each ticket type
+    for name, value in catalog.panel_fields:
+        embed.add_field(name=name, value=value, inline=True)
+    return embed
 
 class TicketSelect(discord.ui.Select):
     def __init__(self, options):
         super().__init__(placeholder="Choose a ticket type...", options=options)
 
+    @timed("select:ticket-type")
     async def callback(self, interaction: discord.Interaction):
         # Import here to avoid circular imports
         from modules.tickets.ticket_modal import TicketModal
@@ -65,43 +46,123 @@ class TicketSelect(discord.ui.Select):
 class TicketCommandsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.CATEGORY_POINTS = CATEGORY_POINTS
-        self.CATEGORY_SLOTS = CATEGORY_SLOTS
-        self.CATEGORY_CHANNEL_NAMES = CATEGORY_CHANNEL_NAMES
+        self.catalogs = TicketCatalogs(bot.db)
+        self.tickets = TicketRegistry(bot.db)
+        from modules.tickets.ticket_views import HelperEmbedUpdater
+        self.embed_updater = HelperEmbedUpdater()
+        from modules.tickets.close_pipeline import ClosePipeline
+        self.close_pipeline = ClosePipeline(bot.db)
+        self._restore_task = None
+
+    async def cog_load(self):
+        """Register the ticket button handler and warm the registry with the open tickets of guilds this process serves"""
+        from modules.tickets.ticket_views import TicketControl
+        from sharding import owns_guild
+
+        self.bot.add_dynamic_items(TicketControl)
+        legacy = []
+        for ticket in await self.bot.db.get_active_tickets():
+            if owns_guild(self.bot, ticket["guild_id"]):
+                record = TicketRecord.from_row(ticket)
+                self.tickets.add(record)
+                if not record.message_id:
+                    legacy.append(record)
+        logger.info(f"✅ Loaded {len(self.tickets)} open tickets")
+        if legacy:
+            self._restore_task = asyncio.create_task(self._restore_legacy_controls(legacy))
+
+    async def _restore_legacy_controls(self, records):
+        """Tickets opened before message ids were stored: find the bot's first message, save its id and re-attach the controls"""
+        from modules.tickets.ticket_views import ticket_controls
+
+        await self.bot.wait_until_ready()
+        restored = 0
+        for record in records:
+            channel = self.bot.get_channel(record.channel_id)
+            if channel is None:
+                continue
+            try:
+                async for message in channel.history(limit=LEGACY_MESSAGE_SEARCH_LIMIT, oldest_first=True):
+                    if message.author.id == self.bot.user.id and message.embeds:
+                        break
+                else:
+                    logger.warning(f"⚠️ No ticket message found in {channel.id}")
+                    continue
+                await message.edit(view=ticket_controls(record.channel_id))
+            except discord.HTTPException as e:
+                logger.warning(f"⚠️ Could not restore controls in {channel.id}: {e}")
+                continue
+            await self.bot.db.set_ticket_message(record.channel_id, message.id)
+            record.message_id = message.id
+            restored += 1
+        logger.info(f"✅ Restored controls on {restored}/{len(records)} legacy tickets")
+
+    async def cog_unload(self):
+        from modules.tickets.ticket_views import TicketControl
+
+        self.bot.remove_dynamic_items(TicketControl)
+        if self._restore_task is not None:
+            self._restore_task.cancel()
+        await self.embed_updater.flush()
+        await self.close_pipeline.drain()
 
     @commands.command(name="create")
     @commands.has_permissions(administrator=True)
     async def create_ticket_panel(self, ctx):
         """Create the ticket selection panel"""
-        embed = Embed(
-            title="🎫 Create a Ticket",
-            description="Select the type of ticket you want to create:",
-            color=discord.Color.blue()
+        catalog = await self.catalogs.get(ctx.guild.id)
+        await ctx.send(embed=catalog.embed("create", create_panel_embed), view=catalog.view("select", TicketSelectView))
+
+    @app_commands.command(name="tickettype", description="Set the points or helper slots of a ticket type (admin)")
+    @app_commands.describe(
+        ticket_type="Ticket type to change; a new name adds a type",
+        points="Points each helper earns when the ticket closes",
+        slots="How many helpers can join"
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def tickettype(self, interaction: discord.Interaction, ticket_type: app_commands.Range[str, 1, MAX_TYPE_NAME],
+                         points: app_commands.Range[int, 0, 1000] = None, slots: app_commands.Range[int, 1, 25] = None):
+        if points is None and slots is None:
+            await interaction.response.send_message("❌ Give `points`, `slots` or both.", ephemeral=True)
+            return
+        catalog = await self.catalogs.get(interaction.guild.id)
+        if ticket_type not in catalog and len(catalog.types) >= MAX_TICKET_TYPES:
+            await interaction.response.send_message(f"❌ A server can have at most {MAX_TICKET_TYPES} ticket types.", ephemeral=True)
+            return
+        catalog = await self.catalogs.update(interaction.guild.id, ticket_type, points=points, slots=slots)
+        updated = catalog.get(ticket_type)
+        await interaction.response.send_message(
+            f"✅ **{updated.name}**: {updated.points} points, {updated.slots} helper slots.", ephemeral=True
         )
-        
-        # Add information about each ticket type
-        for category, points in CATEGORY_POINTS.items():
-            slots = CATEGORY_SLOTS[category]
-            embed.add_field(
-                name=f"🎯 {category}",
-                value=f"Points: {points} | Helpers: {slots}",
-                inline=True
-            )
-        
-        await ctx.send(embed=embed, view=TicketSelectView())
+
+    @tickettype.autocomplete("ticket_type")
+    async def tickettype_autocomplete(self, interaction: discord.Interaction, current: str):
+        catalog = await self.catalogs.get(interaction.guild.id)
+        return [
+            app_commands.Choice(name=ticket_type.name, value=ticket_type.name)
+            for ticket_type in catalog.types if current.lower() in ticket_type.name.lower()
+        ][:25]
 
     async def create_ticket(self, interaction, category, answers):
         """Create a ticket with the given category and answers"""
+        with TICKET_CREATE_DURATION.timer():
+            await self._create_ticket(interaction, category, answers)
+
+    async def _create_ticket(self, interaction, category, answers):
         guild_id = interaction.guild.id
+        ticket_type = (await self.catalogs.get(guild_id)).get(category)
+        if ticket_type is None:
+            await interaction.followup.send("❌ This ticket type no longer exists.", ephemeral=True)
+            return
 
         # Get next ticket number
-        ticket_number = await db.get_next_ticket_number(guild_id, category)
+        ticket_number = await self.bot.db.get_next_ticket_number(guild_id, category)
 
         # Channel name
-        channel_name = f"{CATEGORY_CHANNEL_NAMES[category]}-{ticket_number}"
+        channel_name = f"{ticket_type.channel_prefix}-{ticket_number}"
 
         # Get server configuration
-        server_config = await db.get_server_config(guild_id)
+        server_config = await self.bot.db.get_server_config(guild_id)
         if not server_config or not server_config.get("ticket_category_id"):
             await interaction.followup.send("❌ Ticket category not configured! Use `!setup` first.", ephemeral=True)
             return
@@ -133,12 +194,10 @@ class TicketCommandsCog(commands.Cog):
             reason=f"{category} ticket created by {interaction.user.display_name}"
         )
 
-        # Import TicketView here to avoid circular imports
-        from modules.tickets.ticket_views import TicketView
+        # Import ticket_controls here to avoid circular imports
+        from modules.tickets.ticket_views import ticket_controls
         
-        # Create ticket view
-        slots = CATEGORY_SLOTS[category]
-        ticket_view = TicketView(interaction.user, category, slots, guild_id, ticket_channel)
+        slots = ticket_type.slots
 
         # Create embed
         embed = Embed(title=f"🎫 {category} Ticket #{ticket_number}", color=discord.Color.green())
@@ -150,16 +209,17 @@ class TicketCommandsCog(commands.Cog):
         
         helper_list = [f"{i+1}. [Empty]" for i in range(slots)]
         embed.add_field(name="👥 Helpers", value="\n".join(helper_list), inline=False)
-        embed.add_field(name="🏆 Points Value", value=f"{CATEGORY_POINTS[category]} points", inline=True)
+        embed.add_field(name="🏆 Points Value", value=f"{ticket_type.points} points", inline=True)
 
-        await ticket_channel.send(
+        message = await ticket_channel.send(
             f"Hello {interaction.user.mention}! Your **{category}** ticket has been created.",
             embed=embed,
-            view=ticket_view
+            view=ticket_controls(ticket_channel.id)
         )
 
         # Save ticket in database
-        await db.save_active_ticket(guild_id, ticket_channel.id, interaction.user.id, category, ticket_number)
+        await self.bot.db.save_active_ticket(guild_id, ticket_channel.id, interaction.user.id, category, ticket_number, message.id)
+        self.tickets.add(TicketRecord(guild_id, ticket_channel.id, interaction.user.id, category, ticket_number, message.id))
 
         # Notify user
         await interaction.followup.send(f"✅ Ticket created: {ticket_channel.mention}", ephemeral=True)
@@ -2,10 +2,13 @@
 import discord
 from discord.ui import Modal, TextInput
 from discord import Interaction
+from timing import timed
+from modules.tickets.ticket_catalog import MAX_TYPE_NAME, MODAL_TITLE_SUFFIX
 
 class TicketModal(Modal):
     def __init__(self, category: str, guild_id: int):
-        super().__init__(title=f"{category} Ticket Form")
+        # Types saved before names were capped could overflow the title limit
+        super().__init__(title=f"{category[:MAX_TYPE_NAME]}{MODAL_TITLE_SUFFIX}")
         self.category = category
         self.guild_id = guild_id
 
@@ -46,6 +49,7 @@ class TicketModal(Modal):
         )
         self.add_item(self.additional_info)
 
+    @timed("modal:ticket")
     async def on_submit(self, interaction: Interaction):
         # Defer the response since ticket creation takes time
         await interaction.response.defer(ephemeral=True)
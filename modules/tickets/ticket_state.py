@@ -0,0 +1,53 @@
+# modules/tickets/ticket_state.py
+
+class TicketRecord:
+    """Everything the ticket controls need about one open ticket, as plain ids"""
+    __slots__ = ("guild_id", "channel_id", "owner_id", "category", "ticket_number", "message_id", "helpers")
+
+    def __init__(self, guild_id: int, channel_id: int, owner_id: int, category: str, ticket_number: int,
+                 message_id: int = None, helpers=None):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.owner_id = owner_id
+        self.category = category
+        self.ticket_number = ticket_number
+        self.message_id = message_id
+        self.helpers = list(helpers or [])
+
+    @classmethod
+    def from_row(cls, row: dict):
+        """Build a record from a row returned by DatabaseManager.get_active_ticket(s)"""
+        return cls(row["guild_id"], row["channel_id"], row["creator_id"], row["ticket_type"], row["ticket_number"],
+                   message_id=row["message_id"], helpers=row["helpers"])
+
+class TicketRegistry:
+    """Open tickets by channel id; a record is loaded from active_tickets the first time it is needed"""
+
+    def __init__(self, db):
+        self.db = db
+        self._tickets = {}
+
+    def __len__(self):
+        return len(self._tickets)
+
+    def add(self, record: TicketRecord):
+        self._tickets[record.channel_id] = record
+
+    async def get(self, channel_id: int):
+        record = self._tickets.get(channel_id)
+        if record is None:
+            row = await self.db.get_active_ticket(channel_id)
+            if row is None:
+                return None
+            # Another click may have loaded it while we were waiting on the DB
+            record = self._tickets.setdefault(channel_id, TicketRecord.from_row(row))
+        return record
+
+    def remove(self, channel_id: int):
+        self._tickets.pop(channel_id, None)
+
+    def count_by_guild(self):
+        counts = {}
+        for record in list(self._tickets.values()):
+            counts[record.guild_id] = counts.get(record.guild_id, 0) + 1
+        return counts
@@ -1,241 +1,253 @@
 # modules/tickets/ticket_views.py
 import discord
-from discord.ui import View, Button, Select
+from discord.ui import View, Button, Select, DynamicItem
 from discord import ButtonStyle, Interaction
-from database import DatabaseManager
 import asyncio
+import logging
+from timing import track, timed
+
+logger = logging.getLogger(__name__)
+
+# action -> (label, style, emoji) for the ticket control row
+TICKET_ACTIONS = {
+    "join": ("Join as Helper", ButtonStyle.success, "🙋"),
+    "leave": ("Leave Ticket", ButtonStyle.secondary, "👋"),
+    "remove": ("Remove Helper", ButtonStyle.danger, "🗑️"),
+    "close": ("Close Ticket", ButtonStyle.danger, "🔒"),
+}
+
+def ticket_controls(channel_id: int) -> View:
+    """Build the control row for a ticket message; no per-ticket view is kept in memory"""
+    view = View(timeout=None)
+    for action in TICKET_ACTIONS:
+        view.add_item(TicketControl(action, channel_id))
+    # Stopped views are not stored; clicks are dispatched through the TicketControl template instead
+    view.stop()
+    return view
+
+def is_staff_or_admin(member: discord.Member, config: dict) -> bool:
+    if member.guild_permissions.administrator:
+        return True
+    if config:
+        user_role_ids = [role.id for role in member.roles]
+        for key in ("admin_role_id", "staff_role_id"):
+            if config.get(key) and config[key] in user_role_ids:
+                return True
+    return False
+
+def render_helpers(ticket, slots: int) -> str:
+    helper_list = []
+    for i in range(slots):
+        if i < len(ticket.helpers):
+            helper_list.append(f"{i+1}. <@{ticket.helpers[i]}>")
+        else:
+            helper_list.append(f"{i+1}. [Empty]")
+    return "\n".join(helper_list)
+
+class HelperEmbedUpdater:
+    """Merges bursts of helper changes on a ticket into one edit of its message after `delay` seconds"""
+
+    def __init__(self, delay: float = 1.5):
+        self.delay = delay
+        # channel_id -> [channel, ticket, slots, latest known embed or None]
+        self._pending = {}
+        self._tasks = {}
+
+    def schedule(self, interaction: Interaction, ticket, slots: int):
+        # Button clicks carry the ticket message, so its current embed is free; otherwise it is fetched once at edit time
+        embed = None
+        if interaction.message and interaction.message.id == ticket.message_id and interaction.message.embeds:
+            embed = interaction.message.embeds[0]
+        pending = self._pending.get(ticket.channel_id)
+        if pending:
+            pending[2] = slots
+            pending[3] = embed or pending[3]
+            return
+        self._pending[ticket.channel_id] = [interaction.channel, ticket, slots, embed]
+        self._tasks[ticket.channel_id] = asyncio.create_task(self._edit_later(ticket.channel_id))
+
+    async def _edit_later(self, channel_id: int):
+        await asyncio.sleep(self.delay)
+        self._tasks.pop(channel_id, None)
+        await self._edit(channel_id)
 
-# Initialize database
-db = DatabaseManager()
-
-class TicketView(View):
-    def __init__(self, owner: discord.Member, category: str, slots: int, guild_id: int, channel: discord.TextChannel):
-        super().__init__(timeout=None)
-        self.owner = owner
-        self.category = category
-        self.slots = slots
-        self.guild_id = guild_id
-        self.channel = channel
-        self.helpers = []
-
-        self.add_item(JoinButton(self))
-        self.add_item(LeaveButton(self))
-        self.add_item(RemoveHelperButton(self))
-        self.add_item(CloseButton(self))
-
-    async def update_helpers_embed(self, interaction=None):
-        """Update the helpers list in the embed"""
-        # Get the embed from the message
-        message = interaction.message if interaction else await self.channel.fetch_message(self.channel.last_message.id)
-        embed = message.embeds[0]
-        
-        # Update helpers list
-        helper_list = []
-        for i in range(self.slots):
-            if i < len(self.helpers):
-                helper_list.append(f"{i+1}. {self.helpers[i].mention}")
-            else:
-                helper_list.append(f"{i+1}. [Empty]")
-        
-        # Find and update the helpers field
+    async def _edit(self, channel_id: int):
+        pending = self._pending.pop(channel_id, None)
+        if pending is None:
+            return
+        channel, ticket, slots, embed = pending
+        if not ticket.message_id:
+            return  # Legacy ticket whose message was not found on startup
+        if embed is None:
+            try:
+                embed = (await channel.fetch_message(ticket.message_id)).embeds[0]
+            except discord.HTTPException as e:
+                logger.warning("Could not fetch message for ticket %s: %s", channel_id, e)
+                return
+
+        value = render_helpers(ticket, slots)
         for i, field in enumerate(embed.fields):
             if field.name == "👥 Helpers":
-                embed.set_field_at(i, name="👥 Helpers", value="\n".join(helper_list), inline=False)
+                if field.value == value:
+                    return  # Burst ended where it started; nothing to edit
+                embed.set_field_at(i, name="👥 Helpers", value=value, inline=False)
                 break
-        
-        # Update the message
-        if interaction:
-            await interaction.message.edit(embed=embed, view=self)
-        else:
-            await message.edit(embed=embed, view=self)
 
-class JoinButton(Button):
-    def __init__(self, ticket_view: TicketView):
-        super().__init__(label="Join as Helper", style=ButtonStyle.success, emoji="🙋")
-        self.ticket_view = ticket_view
+        # Omitting view leaves the ticket's buttons untouched
+        try:
+            await channel.get_partial_message(ticket.message_id).edit(embed=embed)
+        except discord.HTTPException as e:
+            logger.warning("Could not update helpers on ticket %s: %s", channel_id, e)
+
+    def cancel(self, channel_id: int):
+        self._pending.pop(channel_id, None)
+        task = self._tasks.pop(channel_id, None)
+        if task:
+            task.cancel()
+
+    async def flush(self):
+        """Apply every pending edit now, e.g. before shutdown"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        for channel_id in list(self._pending):
+            await self._edit(channel_id)
+
+class TicketControl(DynamicItem[Button], template=r"ticket:(?P<action>join|leave|remove|close):(?P<channel_id>[0-9]+)"):
+    """Single handler for every ticket's buttons; state is looked up by the channel id in the custom id"""
+
+    def __init__(self, action: str, channel_id: int):
+        label, style, emoji = TICKET_ACTIONS[action]
+        super().__init__(Button(label=label, style=style, emoji=emoji, custom_id=f"ticket:{action}:{channel_id}"))
+        self.action = action
+        self.channel_id = channel_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: Interaction, item: Button, match):
+        return cls(match["action"], int(match["channel_id"]))
 
     async def callback(self, interaction: Interaction):
-        if interaction.user in self.ticket_view.helpers:
+        with track(f"button:ticket-{self.action}"):
+            ticket_cog = interaction.client.get_cog("TicketCommandsCog")
+            ticket = await ticket_cog.tickets.get(self.channel_id) if ticket_cog else None
+            if ticket is None:
+                await interaction.response.send_message("❌ This ticket is no longer active.", ephemeral=True)
+                return
+            handler = {"join": self.join, "leave": self.leave, "remove": self.remove_helper, "close": self.close}[self.action]
+            await handler(interaction, ticket_cog, ticket)
+
+    async def join(self, interaction: Interaction, ticket_cog, ticket):
+        slots = (await ticket_cog.catalogs.get(ticket.guild_id)).slots(ticket.category)
+        if interaction.user.id in ticket.helpers:
             await interaction.response.send_message("❌ You're already helping with this ticket!", ephemeral=True)
             return
-        if len(self.ticket_view.helpers) >= self.ticket_view.slots:
+        if len(ticket.helpers) >= slots:
             await interaction.response.send_message("❌ This ticket is full!", ephemeral=True)
             return
-        
+
         # Add helper
-        self.ticket_view.helpers.append(interaction.user)
-        await self.ticket_view.channel.set_permissions(interaction.user, view_channel=True, send_messages=True)
-        
+        ticket.helpers.append(interaction.user.id)
+        await interaction.channel.set_permissions(interaction.user, view_channel=True, send_messages=True)
+
         # Update database
-        await db.update_ticket_helpers(self.ticket_view.guild_id, self.ticket_view.channel.id, [h.id for h in self.ticket_view.helpers])
-        
-        # Update embed and respond
-        await self.ticket_view.update_helpers_embed(interaction)
-        await interaction.response.send_message("✅ You joined this ticket as a helper!", ephemeral=True)
+        await interaction.client.db.add_ticket_helper(ticket.channel_id, interaction.user.id)
 
-class LeaveButton(Button):
-    def __init__(self, ticket_view: TicketView):
-        super().__init__(label="Leave Ticket", style=ButtonStyle.secondary, emoji="👋")
-        self.ticket_view = ticket_view
+        # Respond now; the embed edit is debounced with other changes to this ticket
+        ticket_cog.embed_updater.schedule(interaction, ticket, slots)
+        await interaction.response.send_message("✅ You joined this ticket as a helper!", ephemeral=True)
 
-    async def callback(self, interaction: Interaction):
-        if interaction.user not in self.ticket_view.helpers:
+    async def leave(self, interaction: Interaction, ticket_cog, ticket):
+        if interaction.user.id not in ticket.helpers:
             await interaction.response.send_message("❌ You're not helping with this ticket!", ephemeral=True)
             return
-        
+
         # Remove helper
-        self.ticket_view.helpers.remove(interaction.user)
-        await self.ticket_view.channel.set_permissions(interaction.user, overwrite=None)
-        
+        ticket.helpers.remove(interaction.user.id)
+        await interaction.channel.set_permissions(interaction.user, overwrite=None)
+
         # Update database
-        await db.update_ticket_helpers(self.ticket_view.guild_id, self.ticket_view.channel.id, [h.id for h in self.ticket_view.helpers])
-        
-        # Update embed and respond
-        await self.ticket_view.update_helpers_embed(interaction)
-        await interaction.response.send_message("👋 You left the ticket.", ephemeral=True)
+        await interaction.client.db.remove_ticket_helper(ticket.channel_id, interaction.user.id)
 
-class RemoveHelperButton(Button):
-    def __init__(self, ticket_view: TicketView):
-        super().__init__(label="Remove Helper", style=ButtonStyle.danger, emoji="🗑️")
-        self.ticket_view = ticket_view
+        # Respond now; the embed edit is debounced with other changes to this ticket
+        ticket_cog.embed_updater.schedule(interaction, ticket, (await ticket_cog.catalogs.get(ticket.guild_id)).slots(ticket.category))
+        await interaction.response.send_message("👋 You left the ticket.", ephemeral=True)
 
-    async def callback(self, interaction: Interaction):
+    async def remove_helper(self, interaction: Interaction, ticket_cog, ticket):
         # Check permissions
-        config = await db.get_server_config(interaction.guild.id)
-        is_admin = interaction.user.guild_permissions.administrator
-        is_staff = False
-        
-        if config:
-            admin_role_id = config.get("admin_role_id")
-            staff_role_id = config.get("staff_role_id")
-            user_role_ids = [role.id for role in interaction.user.roles]
-            
-            if admin_role_id and admin_role_id in user_role_ids:
-                is_admin = True
-            if staff_role_id and staff_role_id in user_role_ids:
-                is_staff = True
-        
-        if not (is_admin or is_staff):
+        config = await interaction.client.db.get_server_config(interaction.guild.id)
+        if not is_staff_or_admin(interaction.user, config):
             await interaction.response.send_message("❌ Only staff/admins can remove helpers!", ephemeral=True)
             return
-        
-        if not self.ticket_view.helpers:
+
+        if not ticket.helpers:
             await interaction.response.send_message("❌ No helpers to remove!", ephemeral=True)
             return
 
         # Create selection dropdown
-        options = [
-            discord.SelectOption(label=h.display_name, value=str(i)) 
-            for i, h in enumerate(self.ticket_view.helpers)
-        ]
-        select = HelperSelect(self.ticket_view, options)
+        options = []
+        for helper_id in ticket.helpers:
+            member = interaction.guild.get_member(helper_id)
+            label = member.display_name if member else f"User ID {helper_id}"
+            options.append(discord.SelectOption(label=label, value=str(helper_id)))
+        select = HelperSelect(ticket_cog, ticket, options)
         view = View()
         view.add_item(select)
         await interaction.response.send_message("Select helper to remove:", view=view, ephemeral=True)
 
-class HelperSelect(Select):
-    def __init__(self, ticket_view, options):
-        super().__init__(placeholder="Choose a helper to remove...", min_values=1, max_values=1, options=options)
-        self.ticket_view = ticket_view
-
-    async def callback(self, interaction: Interaction):
-        index = int(self.values[0])
-        removed_helper = self.ticket_view.helpers.pop(index)
-        
-        # Remove permissions
-        await self.ticket_view.channel.set_permissions(removed_helper, overwrite=None)
-        
-        # Update database
-        await db.update_ticket_helpers(self.ticket_view.guild_id, self.ticket_view.channel.id, [h.id for h in self.ticket_view.helpers])
-        
-        # Update embed
-        await self.ticket_view.update_helpers_embed()
-        await interaction.response.send_message(f"✅ Removed {removed_helper.mention} from the ticket.", ephemeral=True)
-
-class CloseButton(Button):
-    def __init__(self, ticket_view: TicketView):
-        super().__init__(label="Close Ticket", style=ButtonStyle.danger, emoji="🔒")
-        self.ticket_view = ticket_view
-
-    async def callback(self, interaction: Interaction):
+    async def close(self, interaction: Interaction, ticket_cog, ticket):
         # Check permissions - only ticket owner or staff/admin can close
-        config = await db.get_server_config(interaction.guild.id)
-        is_owner = interaction.user == self.ticket_view.owner
-        is_admin = interaction.user.guild_permissions.administrator
-        is_staff = False
-        
-        if config:
-            admin_role_id = config.get("admin_role_id") 
-            staff_role_id = config.get("staff_role_id")
-            user_role_ids = [role.id for role in interaction.user.roles]
-            
-            if admin_role_id and admin_role_id in user_role_ids:
-                is_admin = True
-            if staff_role_id and staff_role_id in user_role_ids:
-                is_staff = True
-        
-        if not (is_owner or is_admin or is_staff):
+        config = await interaction.client.db.get_server_config(interaction.guild.id)
+        is_owner = interaction.user.id == ticket.owner_id
+
+        if not (is_owner or is_staff_or_admin(interaction.user, config)):
             await interaction.response.send_message("❌ Only the ticket owner or staff can close this ticket!", ephemeral=True)
             return
 
         # Get point values for this category
-        ticket_cog = interaction.client.get_cog("TicketCommandsCog")
-        points = ticket_cog.CATEGORY_POINTS.get(self.ticket_view.category, 0) if ticket_cog else 0
-        
-        # Award points to helpers
-        for helper in self.ticket_view.helpers:
-            await db.add_user_points(self.ticket_view.guild_id, helper.id, points)
-
-        # Save transcript
-        await self.save_transcript(interaction.channel, interaction.user)
-
-        # Remove from active tickets
-        await db.remove_active_ticket(self.ticket_view.guild_id, self.ticket_view.channel.id)
-
-        await interaction.response.send_message(f"🔒 Ticket closed! {len(self.ticket_view.helpers)} helpers awarded {points} points each.", ephemeral=True)
-        
-        # Delete channel after 5 seconds
-        await asyncio.sleep(5)
-        await interaction.channel.delete(reason=f"Ticket closed by {interaction.user.display_name}")
-
-    async def save_transcript(self, channel: discord.TextChannel, closed_by: discord.Member):
-        """Save transcript of the ticket"""
-        config = await db.get_server_config(channel.guild.id)
-        transcript_channel_id = config.get("transcript_channel_id") if config else None
-        
-        if not transcript_channel_id:
-            return  # No transcript channel configured
-        
-        transcript_channel = channel.guild.get_channel(transcript_channel_id)
-        if not transcript_channel:
+        points = (await ticket_cog.catalogs.get(ticket.guild_id)).points(ticket.category)
+
+        # Award points and remove the ticket in one transaction; a second click finds nothing to close
+        closed = await interaction.client.db.close_ticket(ticket.guild_id, ticket.channel_id, ticket.helpers, points,
+                                                           actor_id=interaction.user.id)
+        ticket_cog.tickets.remove(ticket.channel_id)
+        ticket_cog.embed_updater.cancel(ticket.channel_id)
+        if not closed:
+            await interaction.response.send_message("❌ This ticket is already being closed.", ephemeral=True)
+            return
+
+        await interaction.response.send_message(f"🔒 Ticket closed! {len(ticket.helpers)} helpers awarded {points} points each.", ephemeral=True)
+
+        # Transcript and channel deletion run in the background
+        ticket_cog.close_pipeline.submit(ticket, interaction.channel, interaction.user)
+
+class HelperSelect(Select):
+    def __init__(self, ticket_cog, ticket, options):
+        super().__init__(placeholder="Choose a helper to remove...", min_values=1, max_values=1, options=options)
+        self.ticket_cog = ticket_cog
+        self.ticket = ticket
+
+    @timed("select:remove-helper")
+    async def callback(self, interaction: Interaction):
+        helper_id = int(self.values[0])
+        if helper_id not in self.ticket.helpers:
+            await interaction.response.send_message("❌ That helper already left the ticket.", ephemeral=True)
             return
+        self.ticket.helpers.remove(helper_id)
 
-        # Collect messages
-        messages = []
-        async for message in channel.history(limit=None, oldest_first=True):
-            content = message.content if message.content else "[No text content]"
-            timestamp = message.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            messages.append(f"[{timestamp}] {message.author.display_name}: {content}")
-            
-            # Add attachments info
-            for attachment in message.attachments:
-                messages.append(f"    📎 Attachment: {attachment.filename}")
-
-        # Create transcript file
-        transcript_content = f"=== TRANSCRIPT: {channel.name} ===\n" + "\n".join(messages)
-        transcript_file = discord.File(
-            fp=discord.utils.BytesIO(transcript_content.encode('utf-8')),
-            filename=f"transcript-{channel.name}.txt"
-        )
-
-        # Send to transcript channel
-        embed = discord.Embed(
-            title=f"📄 Ticket Transcript: {self.ticket_view.category}",
-            color=discord.Color.red()
-        )
-        embed.add_field(name="Ticket Owner", value=self.ticket_view.owner.mention, inline=True)
-        embed.add_field(name="Closed By", value=closed_by.mention, inline=True)
-        embed.add_field(name="Channel", value=f"#{channel.name}", inline=True)
-        embed.add_field(name="Helpers", value=f"{len(self.ticket_view.helpers)} helpers", inline=True)
-
-        await transcript_channel.send(embed=embed, file=transcript_file)
\ No newline at end of file
+        # Remove permissions
+        removed_helper = interaction.guild.get_member(helper_id)
+        if removed_helper is None:
+            try:
+                removed_helper = await interaction.guild.fetch_member(helper_id)
+            except discord.NotFound:
+                pass  # Left the server; their overwrite goes with the channel
+        if removed_helper:
+            await interaction.channel.set_permissions(removed_helper, overwrite=None)
+
+        # Update database
+        await interaction.client.db.remove_ticket_helper(self.ticket.channel_id, helper_id)
+
+        # Update embed
+        slots = (await self.ticket_cog.catalogs.get(self.ticket.guild_id)).slots(self.ticket.category)
+        self.ticket_cog.embed_updater.schedule(interaction, self.ticket, slots)
+        await interaction.response.send_message(f"✅ Removed <@{helper_id}> from the ticket.", ephemeral=True)
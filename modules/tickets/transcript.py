@@ -0,0 +1,82 @@
+# modules/tickets/transcript.py
+import gzip
+import tempfile
+import discord
+
+# Headroom kept under the upload limit: gzip holds some output in its buffers until close
+UPLOAD_MARGIN = 256 * 1024
+
+class TranscriptWriter:
+    """Spools transcript lines to temp files as they arrive, starting a new part at max_part_size bytes"""
+
+    def __init__(self, name: str, max_part_size: int, compress: bool = False):
+        self.name = name
+        self.max_part_size = max_part_size
+        self.compress = compress
+        self._parts = []
+        self._raw = None
+        self._stream = None
+        self._part_lines = 0
+
+    def _open_part(self):
+        self._raw = tempfile.TemporaryFile()
+        self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb") if self.compress else self._raw
+        self._parts.append(self._raw)
+        self._part_lines = 0
+        part = f" (part {len(self._parts)})" if len(self._parts) > 1 else ""
+        self._stream.write(f"=== TRANSCRIPT: {self.name}{part} ===\n".encode("utf-8"))
+
+    def _close_part(self):
+        if self._stream is not self._raw:
+            self._stream.close()  # writes the gzip trailer, leaves the temp file open
+        self._stream = None
+
+    def write_line(self, line: str):
+        data = (line + "\n").encode("utf-8")
+        if self._raw is None:
+            self._open_part()
+        elif self._part_lines and self._raw.tell() + len(data) > self.max_part_size:
+            self._close_part()
+            self._open_part()
+        self._stream.write(data)
+        self._part_lines += 1
+
+    def write_message(self, message: discord.Message):
+        content = message.content if message.content else "[No text content]"
+        timestamp = message.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        self.write_line(f"[{timestamp}] {message.author.display_name}: {content}")
+        for attachment in message.attachments:
+            self.write_line(f"    📎 Attachment: {attachment.filename}")
+
+    def finish(self):
+        """Return one discord.File per part; sending a File closes its temp file"""
+        if self._raw is None:
+            self._open_part()
+        self._close_part()
+        suffix = ".txt.gz" if self.compress else ".txt"
+        files = []
+        for i, raw in enumerate(self._parts, start=1):
+            raw.seek(0)
+            part = f"-part{i}" if len(self._parts) > 1 else ""
+            files.append(discord.File(fp=raw, filename=f"transcript-{self.name}{part}{suffix}"))
+        self._parts = []
+        self._raw = None
+        return files
+
+    def close(self):
+        """Discard any parts that were never handed out by finish()"""
+        for raw in self._parts:
+            raw.close()
+        self._parts = []
+        self._raw = None
+
+async def export_transcript(channel: discord.TextChannel, compress: bool = False):
+    """Stream a channel's history page by page into transcript parts sized for this guild's upload limit"""
+    writer = TranscriptWriter(channel.name, channel.guild.filesize_limit - UPLOAD_MARGIN, compress)
+    try:
+        async for message in channel.history(limit=None, oldest_first=True):
+            writer.write_message(message)
+        return writer.finish()
+    except BaseException:
+        writer.close()
+        raise
@@ -2,51 +2,67 @@ import discord
 from discord import app_commands, Embed
 from discord.ext import commands
 
+def help_embed():
+    embed = Embed(
+        title="✨ Bot Commands & Help",
+        description="Welcome! Here are all the commands you can use.",
+        color=discord.Color.blurple()
+    )
+    embed.add_field(
+        name="🎟️ Ticket Commands",
+        value=(
+            "`/panel` — Create ticket panel (admin, staff)\n"
+            "`/removehelper @user` — Remove helper from ticket (admin, staff)\n"
+            "`/tickettype type [points] [slots]` — Add or change a ticket type (admin)"
+        ),
+        inline=False
+    )
+    embed.add_field(
+        name="📈 Points & Leaderboard",
+        value=(
+            "`/leaderboard [window]` — View top helpers, all-time or this week/month/season\n"
+            "`/points [@user]` — See someone's points\n"
+            "`/myrank [window]` — See your leaderboard rank, all-time or this week/month/season\n"
+            "`/history [@user]` — See someone's points history\n"
+            "`/addpoints @user amount` — Add points (admin/staff)\n"
+            "`/removepoints @user amount` — Remove points (admin/staff)\n"
+            "`/setpoints @user amount` — Set points (admin/staff)\n"
+            "`/removeuser @user` — Remove user from leaderboard (admin/staff)\n"
+            "`/resetlb` — Reset entire leaderboard (admin)"
+        ),
+        inline=False
+    )
+    embed.add_field(
+        name="📜 Rules & Setup",
+        value=(
+            "`/hrules` — Helper guidelines\n"
+            "`/rrules` — Requester guidelines\n"
+            "`/proof` — Proof requirements\n"
+            "`/setup` — Configure server settings (admin)"
+        ),
+        inline=False
+    )
+    embed.add_field(
+        name="🛠️ Diagnostics",
+        value=(
+            "`/latency` — Command latency percentiles (admin)\n"
+            "`/dbprofile [action]` — Show or control the database query profiler (admin)"
+        ),
+        inline=False
+    )
+    embed.set_footer(text="Need more help? Contact a member of the staff team!")
+    return embed
+
+# Same for every guild, so serialized once at import
+HELP_PAYLOAD = help_embed().to_dict()
+
 class HelpCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
     @app_commands.command(name="help", description="Show all bot commands and help")
     async def help(self, interaction: discord.Interaction):
-        embed = Embed(
-            title="✨ Bot Commands & Help",
-            description="Welcome! Here are all the commands you can use.",
-            color=discord.Color.blurple()
-        )
-        embed.add_field(
-            name="🎟️ Ticket Commands",
-            value=(
-                "`/panel` — Create ticket panel (admin, staff)\n"
-                "`/removehelper @user` — Remove helper from ticket (admin, staff)"
-            ),
-            inline=False
-        )
-        embed.add_field(
-            name="📈 Points & Leaderboard",
-            value=(
-                "`/leaderboard` — View top helpers\n"
-                "`/points [@user]` — See someone's points\n"
-                "`/myrank` — See your leaderboard rank\n"
-                "`/addpoints @user amount` — Add points (admin/staff)\n"
-                "`/removepoints @user amount` — Remove points (admin/staff)\n"
-                "`/setpoints @user amount` — Set points (admin/staff)\n"
-                "`/removeuser @user` — Remove user from leaderboard (admin/staff)\n"
-                "`/resetlb` — Reset entire leaderboard (admin)"
-            ),
-            inline=False
-        )
-        embed.add_field(
-            name="📜 Rules & Setup",
-            value=(
-                "`/hrules` — Helper guidelines\n"
-                "`/rrules` — Requester guidelines\n"
-                "`/proof` — Proof requirements\n"
-                "`/setup` — Configure server settings (admin)"
-            ),
-            inline=False
-        )
-        embed.set_footer(text="Need more help? Contact a member of the staff team!")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=Embed.from_dict(HELP_PAYLOAD), ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(HelpCog(bot))
\ No newline at end of file
@@ -0,0 +1,73 @@
+import discord
+from discord import app_commands, Embed
+from discord.ext import commands
+import timing
+
+class StatsCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="latency", description="Show command latency percentiles (admin)")
+    @app_commands.describe(command="Only show this command, e.g. /points or button:ticket-join (optional)")
+    @app_commands.default_permissions(administrator=True)
+    async def latency(self, interaction: discord.Interaction, command: str = None):
+        stats = timing.percentiles(command)
+        if not stats:
+            await interaction.response.send_message("No latency samples recorded yet.", ephemeral=True)
+            return
+
+        embed = Embed(
+            title="⏱️ Command Latency",
+            description=f"Gateway heartbeat: {self.bot.latency * 1000:.0f} ms\np50 / p95 / p99 in ms, over the last {timing.SAMPLE_SIZE} calls",
+            color=discord.Color.blurple()
+        )
+        # Slowest first; an embed holds at most 25 fields
+        ranked = sorted(stats.items(), key=lambda item: item[1]["wall"][99], reverse=True)
+        for name, entry in ranked[:25]:
+            lines = [
+                f"{part}: " + " / ".join(f"{entry[part][q] * 1000:.0f}" for q in (50, 95, 99))
+                for part in ("wall", "db", "rest", "local")
+            ]
+            embed.add_field(name=f"{name} ({entry['count']})", value="\n".join(lines), inline=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="dbprofile", description="Show or control the database query profiler (admin)")
+    @app_commands.describe(action="What to do (default: show)")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="Show", value="show"),
+        app_commands.Choice(name="Enable", value="enable"),
+        app_commands.Choice(name="Disable", value="disable"),
+        app_commands.Choice(name="Reset", value="reset"),
+    ])
+    @app_commands.default_permissions(administrator=True)
+    async def dbprofile(self, interaction: discord.Interaction, action: str = "show"):
+        db = self.bot.db
+        if action == "enable":
+            if not db.supports_profiling:
+                await interaction.response.send_message(f"❌ {type(db).__name__} does not support query profiling.", ephemeral=True)
+                return
+            db.enable_profiling()
+            await interaction.response.send_message("🔬 Query profiling enabled.", ephemeral=True)
+            return
+        if db.profiler is None:
+            await interaction.response.send_message("Query profiling is off. Use `/dbprofile enable` first.", ephemeral=True)
+            return
+        if action == "disable":
+            db.disable_profiling()
+            await interaction.response.send_message("🔬 Query profiling disabled.", ephemeral=True)
+            return
+        if action == "reset":
+            db.profiler.reset()
+            await interaction.response.send_message("🔬 Query profile cleared.", ephemeral=True)
+            return
+
+        # Trim whole lines to stay under the 2000 character message limit
+        text = ""
+        for line in db.profiler.dump(limit=15).splitlines():
+            if len(text) + len(line) > 1880:
+                break
+            text += line + "\n"
+        await interaction.response.send_message(f"```\n{text}```", ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(StatsCog(bot))
@@ -0,0 +1,515 @@
+# postgres_storage.py
+"""PostgreSQL backend on an asyncpg connection pool (pip install asyncpg).
+
+Writes go straight to the database, without the SQLite backend's write-behind
+buffer or in-process leaderboard index, so any number of bot processes and
+hosts can share one database.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from metrics import time_methods
+from storage import SERVER_CONFIG_COLUMNS, Storage, current_bucket, group_ticket_rows, rollup_rows
+
+try:
+    import asyncpg
+except ImportError:  # optional dependency, only needed for postgresql:// URLs
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+# Same shape as migrations.MIGRATIONS; the applied version is kept in schema_version
+PG_MIGRATIONS = [
+    (1, "initial schema", (
+        '''
+        CREATE TABLE IF NOT EXISTS server_config (
+            guild_id BIGINT PRIMARY KEY,
+            admin_role_id BIGINT,
+            staff_role_id BIGINT,
+            helper_role_id BIGINT,
+            viewer_role_id BIGINT,
+            blocked_role_id BIGINT,
+            reward_role_id BIGINT,
+            ticket_category_id BIGINT,
+            transcript_channel_id BIGINT,
+            created_at TIMESTAMPTZ DEFAULT now(),
+            updated_at TIMESTAMPTZ DEFAULT now()
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS point_values (
+            guild_id BIGINT,
+            ticket_type TEXT,
+            points INTEGER,
+            PRIMARY KEY (guild_id, ticket_type)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS helper_slots (
+            guild_id BIGINT,
+            ticket_type TEXT,
+            slots INTEGER,
+            PRIMARY KEY (guild_id, ticket_type)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS custom_commands (
+            guild_id BIGINT,
+            command_name TEXT,
+            content TEXT NOT NULL,
+            image_url TEXT,
+            PRIMARY KEY (guild_id, command_name)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_points (
+            guild_id BIGINT,
+            user_id BIGINT,
+            points BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_user_points_rank ON user_points (guild_id, points DESC, user_id)',
+        '''
+        CREATE TABLE IF NOT EXISTS active_tickets (
+            guild_id BIGINT,
+            channel_id BIGINT PRIMARY KEY,
+            creator_id BIGINT,
+            ticket_type TEXT,
+            ticket_number INTEGER,
+            created_at TIMESTAMPTZ DEFAULT now(),
+            message_id BIGINT
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_active_tickets_guild_type ON active_tickets (guild_id, ticket_type)',
+        'CREATE INDEX IF NOT EXISTS idx_active_tickets_creator ON active_tickets (creator_id)',
+        '''
+        CREATE TABLE IF NOT EXISTS ticket_sequences (
+            guild_id BIGINT,
+            ticket_type TEXT,
+            last_number INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, ticket_type)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS ticket_helpers (
+            channel_id BIGINT,
+            user_id BIGINT,
+            slot INTEGER NOT NULL,
+            joined_at TIMESTAMPTZ DEFAULT now(),
+            PRIMARY KEY (channel_id, user_id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_ticket_helpers_user ON ticket_helpers (user_id)',
+        '''
+        CREATE TABLE IF NOT EXISTS points_ledger (
+            id BIGSERIAL PRIMARY KEY,
+            guild_id BIGINT NOT NULL,
+            user_id BIGINT NOT NULL,
+            delta BIGINT NOT NULL,
+            reason TEXT NOT NULL,
+            channel_id BIGINT,
+            actor_id BIGINT,
+            created_at BIGINT NOT NULL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_points_ledger_user ON points_ledger (guild_id, user_id, id)',
+        'CREATE INDEX IF NOT EXISTS idx_points_ledger_guild ON points_ledger (guild_id, id)',
+        '''
+        CREATE TABLE IF NOT EXISTS ledger_snapshots (
+            ledger_id BIGINT PRIMARY KEY,
+            taken_at BIGINT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS points_snapshots (
+            guild_id BIGINT,
+            user_id BIGINT,
+            points BIGINT NOT NULL,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS points_rollups (
+            guild_id BIGINT,
+            period TEXT,
+            bucket TEXT,
+            user_id BIGINT,
+            points BIGINT NOT NULL,
+            PRIMARY KEY (guild_id, period, bucket, user_id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_points_rollups_rank ON points_rollups (guild_id, period, bucket, points DESC, user_id)',
+        '''
+        CREATE TABLE IF NOT EXISTS bot_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+        ''',
+    )),
+    # Helper lookups start from the helper's rows and read channel ids from the index alone
+    (2, "ticket_helpers user index", (
+        'CREATE INDEX IF NOT EXISTS idx_ticket_helpers_user_channel ON ticket_helpers (user_id, channel_id)',
+        'DROP INDEX IF EXISTS idx_ticket_helpers_user',
+    )),
+]
+
+PG_SCHEMA_VERSION = PG_MIGRATIONS[-1][0]
+
+# Serializes migrations across every process that starts against the database
+_MIGRATION_LOCK_ID = 0x7469636B
+
+_LEDGER_INSERT = '''
+    INSERT INTO points_ledger (guild_id, user_id, delta, reason, channel_id, actor_id, created_at)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+'''
+
+_ROLLUP_UPSERT = '''
+    INSERT INTO points_rollups (guild_id, period, bucket, user_id, points) VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (guild_id, period, bucket, user_id) DO UPDATE SET points = points_rollups.points + excluded.points
+'''
+
+# Admin corrections move the current windows too, but never below zero: a window only holds points earned in it
+_ROLLUP_CORRECT = '''
+    INSERT INTO points_rollups (guild_id, period, bucket, user_id, points) VALUES ($1, $2, $3, $4, GREATEST($5, 0))
+    ON CONFLICT (guild_id, period, bucket, user_id) DO UPDATE SET points = GREATEST(points_rollups.points + $5, 0)
+'''
+
+_POINTS_UPSERT = '''
+    INSERT INTO user_points (guild_id, user_id, points) VALUES ($1, $2, $3)
+    ON CONFLICT (guild_id, user_id) DO UPDATE SET points = user_points.points + excluded.points
+'''
+
+_TICKET_QUERY = '''
+    SELECT t.guild_id, t.channel_id, t.creator_id, t.ticket_type, t.ticket_number, t.message_id, h.user_id AS helper_id
+    FROM active_tickets t LEFT JOIN ticket_helpers h ON h.channel_id = t.channel_id
+'''
+
+def _rowcount(status: str) -> int:
+    """Rows affected, from a command status such as 'DELETE 1'"""
+    return int(status.rsplit(" ", 1)[-1])
+
+class PostgresStorage(Storage):
+    """PostgreSQL backend; every method is one round trip or one transaction on a pooled connection"""
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10):
+        if asyncpg is None:
+            raise RuntimeError("PostgreSQL storage needs asyncpg: pip install asyncpg")
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = None
+        self._connect_lock = asyncio.Lock()
+
+    # ===================== Lifecycle =====================
+    async def connect(self):
+        async with self._connect_lock:
+            if self._pool is None:
+                self._pool = await asyncpg.create_pool(self.dsn, min_size=self.min_size, max_size=self.max_size)
+
+    async def close(self):
+        async with self._connect_lock:
+            if self._pool is not None:
+                await self._pool.close()
+                self._pool = None
+
+    async def _acquire(self):
+        if self._pool is None:
+            await self.connect()
+        return self._pool
+
+    @asynccontextmanager
+    async def _transaction(self):
+        pool = await self._acquire()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
+    async def _fetch(self, sql, *args):
+        return await (await self._acquire()).fetch(sql, *args)
+
+    async def _fetchrow(self, sql, *args):
+        return await (await self._acquire()).fetchrow(sql, *args)
+
+    async def _fetchval(self, sql, *args):
+        return await (await self._acquire()).fetchval(sql, *args)
+
+    async def _execute(self, sql, *args):
+        return await (await self._acquire()).execute(sql, *args)
+
+    async def ping(self):
+        await self._fetchval('SELECT 1')
+
+    async def initialize_database(self):
+        """Apply pending PG_MIGRATIONS in one transaction under an advisory lock"""
+        async with self._transaction() as conn:
+            await conn.execute('SELECT pg_advisory_xact_lock($1)', _MIGRATION_LOCK_ID)
+            await conn.execute('CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)')
+            current = await conn.fetchval('SELECT MAX(version) FROM schema_version') or 0
+            if current > PG_SCHEMA_VERSION:
+                logger.warning(f"⚠️ Database schema is version {current}, newer than this code ({PG_SCHEMA_VERSION}); not migrating")
+                return current, current
+            for version, description, steps in PG_MIGRATIONS:
+                if version <= current:
+                    continue
+                for step in steps:
+                    if callable(step):
+                        await step(conn)
+                    else:
+                        await conn.execute(step)
+                logger.info(f"🗄️ Applied migration {version}: {description}")
+            if current < PG_SCHEMA_VERSION:
+                await conn.execute('DELETE FROM schema_version')
+                await conn.execute('INSERT INTO schema_version (version) VALUES ($1)', PG_SCHEMA_VERSION)
+                await conn.execute('ANALYZE')
+        return current, PG_SCHEMA_VERSION
+
+    # ===================== Server Config =====================
+    async def get_server_config(self, guild_id: int):
+        row = await self._fetchrow('SELECT * FROM server_config WHERE guild_id = $1', guild_id)
+        return dict(row) if row else None
+
+    async def update_server_config(self, guild_id: int, **kwargs):
+        unknown = set(kwargs) - set(SERVER_CONFIG_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown server_config columns: {', '.join(sorted(unknown))}")
+        columns = list(kwargs)
+        placeholders = ', '.join(f'${i}' for i in range(2, len(columns) + 2))
+        updates = ''.join(f'{column} = excluded.{column}, ' for column in columns)
+        await self._execute(f'''
+            INSERT INTO server_config (guild_id{''.join(', ' + column for column in columns)})
+            VALUES ($1{', ' + placeholders if columns else ''})
+            ON CONFLICT (guild_id) DO UPDATE SET {updates}updated_at = now()
+        ''', guild_id, *kwargs.values())
+
+    async def _get_ticket_settings(self, table: str, column: str, guild_id: int):
+        rows = await self._fetch(f'SELECT ticket_type, {column} FROM {table} WHERE guild_id = $1', guild_id)
+        return {row[0]: row[1] for row in rows} if rows else None
+
+    async def _set_ticket_settings(self, table: str, column: str, guild_id: int, values: dict):
+        async with self._transaction() as conn:
+            await conn.execute(f'DELETE FROM {table} WHERE guild_id = $1', guild_id)
+            await conn.executemany(
+                f'INSERT INTO {table} (guild_id, ticket_type, {column}) VALUES ($1, $2, $3)',
+                [(guild_id, ticket_type, value) for ticket_type, value in values.items()]
+            )
+
+    async def get_point_values(self, guild_id: int):
+        return await self._get_ticket_settings('point_values', 'points', guild_id)
+
+    async def set_point_values(self, guild_id: int, point_values: dict):
+        await self._set_ticket_settings('point_values', 'points', guild_id, point_values)
+
+    async def get_helper_slots(self, guild_id: int):
+        return await self._get_ticket_settings('helper_slots', 'slots', guild_id)
+
+    async def set_helper_slots(self, guild_id: int, helper_slots: dict):
+        await self._set_ticket_settings('helper_slots', 'slots', guild_id, helper_slots)
+
+    # ===================== Custom Commands =====================
+    async def get_custom_command(self, guild_id: int, command_name: str):
+        row = await self._fetchrow('SELECT content, image_url FROM custom_commands WHERE guild_id = $1 AND command_name = $2', guild_id, command_name)
+        if row:
+            return {'content': row[0], 'image_url': row[1]}
+        return None
+
+    async def set_custom_command(self, guild_id: int, command_name: str, content: str, image_url: str = None):
+        await self._execute('''
+            INSERT INTO custom_commands (guild_id, command_name, content, image_url) VALUES ($1, $2, $3, $4)
+            ON CONFLICT (guild_id, command_name) DO UPDATE SET content = excluded.content, image_url = excluded.image_url
+        ''', guild_id, command_name, content, image_url or "")
+
+    # ===================== Bot Meta =====================
+    async def get_meta(self, key: str):
+        return await self._fetchval('SELECT value FROM bot_meta WHERE key = $1', key)
+
+    async def set_meta(self, key: str, value: str):
+        await self._execute('''
+            INSERT INTO bot_meta (key, value) VALUES ($1, $2) ON CONFLICT (key) DO UPDATE SET value = excluded.value
+        ''', key, value)
+
+    # ===================== Points =====================
+    @staticmethod
+    async def _award(conn, events):
+        await conn.executemany(_LEDGER_INSERT, events)
+        await conn.executemany(_ROLLUP_UPSERT, rollup_rows(events))
+        await conn.executemany(_POINTS_UPSERT, [(guild_id, user_id, delta) for guild_id, user_id, delta, *_ in events])
+
+    @staticmethod
+    async def _correct(conn, events):
+        """Record admin corrections in the ledger and the current windows; user_points is the caller's job"""
+        await conn.executemany(_LEDGER_INSERT, events)
+        await conn.executemany(_ROLLUP_CORRECT, rollup_rows([event for event in events if event[2]]))
+
+    async def get_user_points(self, guild_id: int, user_id: int):
+        return await self._fetchval('SELECT points FROM user_points WHERE guild_id = $1 AND user_id = $2', guild_id, user_id) or 0
+
+    async def set_user_points(self, guild_id: int, user_id: int, amount: int, actor_id: int = None):
+        async with self._transaction() as conn:
+            old = await conn.fetchval('SELECT points FROM user_points WHERE guild_id = $1 AND user_id = $2 FOR UPDATE', guild_id, user_id)
+            await self._correct(conn, [(guild_id, user_id, amount - (old or 0), 'set', None, actor_id, int(time.time()))])
+            await conn.execute('''
+                INSERT INTO user_points (guild_id, user_id, points) VALUES ($1, $2, $3)
+                ON CONFLICT (guild_id, user_id) DO UPDATE SET points = excluded.points
+            ''', guild_id, user_id, amount)
+
+    async def add_points_bulk(self, guild_id: int, user_ids: list, amount: int, reason: str = "add", channel_id: int = None,
+                              actor_id: int = None):
+        now = int(time.time())
+        async with self._transaction() as conn:
+            await self._award(conn, [(guild_id, user_id, amount, reason, channel_id, actor_id, now) for user_id in user_ids])
+
+    async def get_all_user_points(self, guild_id: int):
+        rows = await self._fetch('SELECT user_id, points FROM user_points WHERE guild_id = $1 ORDER BY points DESC', guild_id)
+        return {row[0]: row[1] for row in rows}
+
+    async def clear_all_points(self, guild_id: int, actor_id: int = None):
+        async with self._transaction() as conn:
+            rows = await conn.fetch('SELECT user_id, points FROM user_points WHERE guild_id = $1 AND points != 0 FOR UPDATE', guild_id)
+            now = int(time.time())
+            await self._correct(conn, [(guild_id, user_id, -points, 'reset', None, actor_id, now) for user_id, points in rows])
+            await conn.execute('DELETE FROM user_points WHERE guild_id = $1', guild_id)
+
+    async def remove_user(self, guild_id: int, user_id: int, actor_id: int = None):
+        async with self._transaction() as conn:
+            points = await conn.fetchval(
+                'SELECT points FROM user_points WHERE guild_id = $1 AND user_id = $2 AND points != 0 FOR UPDATE', guild_id, user_id
+            )
+            if points:
+                await self._correct(conn, [(guild_id, user_id, -points, 'remove', None, actor_id, int(time.time()))])
+            await conn.execute('DELETE FROM user_points WHERE guild_id = $1 AND user_id = $2', guild_id, user_id)
+
+    async def get_top_points(self, guild_id: int, limit: int = 10, window: str = "all"):
+        if window == "all":
+            rows = await self._fetch('''
+                SELECT user_id, points FROM user_points WHERE guild_id = $1 ORDER BY points DESC, user_id LIMIT $2
+            ''', guild_id, limit)
+        else:
+            rows = await self._fetch('''
+                SELECT user_id, points FROM points_rollups
+                WHERE guild_id = $1 AND period = $2 AND bucket = $3 AND points != 0
+                ORDER BY points DESC, user_id LIMIT $4
+            ''', guild_id, window, current_bucket(window), limit)
+        return [(row[0], row[1]) for row in rows]
+
+    async def get_user_rank(self, guild_id: int, user_id: int, window: str = "all"):
+        if window == "all":
+            points = await self._fetchval('SELECT points FROM user_points WHERE guild_id = $1 AND user_id = $2', guild_id, user_id)
+            if points is None:
+                return None
+            ahead = await self._fetchval('''
+                SELECT COUNT(*) FROM user_points
+                WHERE guild_id = $1 AND (points > $2 OR (points = $2 AND user_id < $3))
+            ''', guild_id, points, user_id)
+            return ahead + 1, points
+        bucket = current_bucket(window)
+        points = await self._fetchval('''
+            SELECT points FROM points_rollups WHERE guild_id = $1 AND period = $2 AND bucket = $3 AND user_id = $4
+        ''', guild_id, window, bucket, user_id)
+        if not points:
+            return None
+        ahead = await self._fetchval('''
+            SELECT COUNT(*) FROM points_rollups
+            WHERE guild_id = $1 AND period = $2 AND bucket = $3 AND points != 0
+              AND (points > $4 OR (points = $4 AND user_id < $5))
+        ''', guild_id, window, bucket, points, user_id)
+        return ahead + 1, points
+
+    async def get_points_history(self, guild_id: int, user_id: int, before_id: int = None, limit: int = 10):
+        rows = await self._fetch('''
+            SELECT id, delta, reason, channel_id, actor_id, created_at FROM points_ledger
+            WHERE guild_id = $1 AND user_id = $2 AND id < $3 ORDER BY id DESC LIMIT $4
+        ''', guild_id, user_id, before_id if before_id is not None else 2 ** 63 - 1, limit)
+        return [dict(row) for row in rows]
+
+    async def replay_points(self, guild_id: int):
+        rows = await self._fetch('''
+            SELECT user_id, SUM(points) FROM (
+                SELECT user_id, points FROM points_snapshots WHERE guild_id = $1
+                UNION ALL
+                SELECT user_id, delta FROM points_ledger
+                WHERE guild_id = $1 AND id > (SELECT COALESCE(MAX(ledger_id), 0) FROM ledger_snapshots)
+            ) AS totals GROUP BY user_id HAVING SUM(points) != 0
+        ''', guild_id)
+        return {row[0]: row[1] for row in rows}
+
+    async def snapshot_points(self):
+        async with self._transaction() as conn:
+            # Waits for in-flight ledger writers and holds off new ones, so no lower id can commit after the snapshot
+            await conn.execute('LOCK TABLE points_ledger IN SHARE MODE')
+            await conn.execute('''
+                INSERT INTO ledger_snapshots (ledger_id, taken_at)
+                SELECT COALESCE(MAX(id), 0), $1 FROM points_ledger
+                ON CONFLICT (ledger_id) DO UPDATE SET taken_at = excluded.taken_at
+            ''', int(time.time()))
+            await conn.execute('DELETE FROM points_snapshots')
+            await conn.execute('INSERT INTO points_snapshots (guild_id, user_id, points) SELECT guild_id, user_id, points FROM user_points')
+
+    # ===================== Tickets =====================
+    async def get_next_ticket_number(self, guild_id: int, ticket_type: str):
+        """Allocate atomically in the database, so processes sharing a guild never hand out the same number"""
+        return await self._fetchval('''
+            INSERT INTO ticket_sequences (guild_id, ticket_type, last_number)
+            VALUES ($1, $2, COALESCE((SELECT MAX(ticket_number) FROM active_tickets WHERE guild_id = $1 AND ticket_type = $2), 0) + 1)
+            ON CONFLICT (guild_id, ticket_type) DO UPDATE SET last_number = ticket_sequences.last_number + 1
+            RETURNING last_number
+        ''', guild_id, ticket_type)
+
+    async def save_active_ticket(self, guild_id: int, channel_id: int, creator_id: int, ticket_type: str, ticket_number: int, message_id: int = None):
+        async with self._transaction() as conn:
+            await conn.execute('''
+                INSERT INTO active_tickets (guild_id, channel_id, creator_id, ticket_type, ticket_number, message_id)
+                VALUES ($1, $2, $3, $4, $5, $6)
+            ''', guild_id, channel_id, creator_id, ticket_type, ticket_number, message_id)
+            await conn.execute('''
+                INSERT INTO ticket_sequences (guild_id, ticket_type, last_number) VALUES ($1, $2, $3)
+                ON CONFLICT (guild_id, ticket_type) DO UPDATE SET last_number = GREATEST(ticket_sequences.last_number, excluded.last_number)
+            ''', guild_id, ticket_type, ticket_number)
+
+    async def set_ticket_message(self, channel_id: int, message_id: int):
+        await self._execute('UPDATE active_tickets SET message_id = $1 WHERE channel_id = $2', message_id, channel_id)
+
+    async def get_active_ticket(self, channel_id: int):
+        rows = await self._fetch(_TICKET_QUERY + 'WHERE t.channel_id = $1 ORDER BY h.slot', channel_id)
+        tickets = group_ticket_rows(rows)
+        return tickets[0] if tickets else None
+
+    async def get_active_tickets(self):
+        return group_ticket_rows(await self._fetch(_TICKET_QUERY + 'ORDER BY t.channel_id, h.slot'))
+
+    async def get_helper_tickets(self, guild_id: int, user_id: int):
+        rows = await self._fetch('''
+            SELECT t.channel_id FROM ticket_helpers h JOIN active_tickets t ON t.channel_id = h.channel_id
+            WHERE h.user_id = $1 AND t.guild_id = $2
+        ''', user_id, guild_id)
+        return [row[0] for row in rows]
+
+    async def remove_active_ticket(self, guild_id: int, channel_id: int):
+        async with self._transaction() as conn:
+            await conn.execute('DELETE FROM active_tickets WHERE guild_id = $1 AND channel_id = $2', guild_id, channel_id)
+            await conn.execute('DELETE FROM ticket_helpers WHERE channel_id = $1', channel_id)
+
+    async def close_ticket(self, guild_id: int, channel_id: int, helper_ids: list, points: int, actor_id: int = None):
+        async with self._transaction() as conn:
+            status = await conn.execute('DELETE FROM active_tickets WHERE guild_id = $1 AND channel_id = $2', guild_id, channel_id)
+            if _rowcount(status) == 0:
+                return False
+            await conn.execute('DELETE FROM ticket_helpers WHERE channel_id = $1', channel_id)
+            if points and helper_ids:
+                now = int(time.time())
+                await self._award(conn, [(guild_id, user_id, points, 'ticket', channel_id, actor_id, now) for user_id in helper_ids])
+        return True
+
+    async def add_ticket_helper(self, channel_id: int, user_id: int):
+        await self._execute('''
+            INSERT INTO ticket_helpers (channel_id, user_id, slot)
+            SELECT $1, $2, COALESCE(MAX(slot), -1) + 1 FROM ticket_helpers WHERE channel_id = $1
+            ON CONFLICT (channel_id, user_id) DO NOTHING
+        ''', channel_id, user_id)
+
+    async def remove_ticket_helper(self, channel_id: int, user_id: int):
+        await self._execute('DELETE FROM ticket_helpers WHERE channel_id = $1 AND user_id = $2', channel_id, user_id)
+
+# Every public method is timed for /metrics
+time_methods(PostgresStorage)
@@ -0,0 +1,104 @@
+# query_profiler.py
+import time
+from collections import deque
+
+class QueryStats:
+    __slots__ = ("count", "total", "rows", "samples")
+
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=sample_size)
+
+class QueryProfiler:
+    """Per-statement call count, time and rows for DatabaseManager; only attached while profiling is on"""
+
+    def __init__(self, sample_size: int = 2048):
+        self.sample_size = sample_size
+        self._stats = {}
+        # Statement text as written -> whitespace-normalized key
+        self._keys = {}
+
+    def record(self, sql: str, seconds: float, rows: int = 0):
+        key = self._keys.get(sql)
+        if key is None:
+            key = self._keys[sql] = " ".join(sql.split())
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = QueryStats(self.sample_size)
+        stats.count += 1
+        stats.total += seconds
+        stats.rows += rows
+        stats.samples.append(seconds)
+
+    def statements(self):
+        return list(self._stats)
+
+    def stats(self):
+        """Return one dict per statement, most total time first"""
+        result = []
+        for sql, stats in self._stats.items():
+            ordered = sorted(stats.samples)
+            result.append({
+                "sql": sql,
+                "count": stats.count,
+                "total": stats.total,
+                "mean": stats.total / stats.count,
+                "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+                "rows": stats.rows,
+            })
+        result.sort(key=lambda entry: entry["total"], reverse=True)
+        return result
+
+    def dump(self, limit: int = None) -> str:
+        """Plain-text table of stats(), for logs or a code block"""
+        lines = [f"{'count':>8} {'total ms':>10} {'p99 ms':>8} {'rows':>8}  statement"]
+        for entry in self.stats()[:limit]:
+            sql = entry["sql"] if len(entry["sql"]) <= 120 else entry["sql"][:117] + "..."
+            lines.append(f"{entry['count']:>8} {entry['total'] * 1000:>10.1f} {entry['p99'] * 1000:>8.2f} {entry['rows']:>8}  {sql}")
+        return "\n".join(lines)
+
+    def reset(self):
+        self._stats.clear()
+
+class _TimedExecute:
+    """Stands in for aiosqlite's execute() result: usable with await and with async with"""
+
+    def __init__(self, profiler: QueryProfiler, sql: str, pending):
+        self._profiler = profiler
+        self._sql = sql
+        self._pending = pending
+        self._cursor = None
+
+    async def _run(self):
+        start = time.perf_counter()
+        cursor = await self._pending
+        self._profiler.record(self._sql, time.perf_counter() - start, max(cursor.rowcount, 0))
+        return cursor
+
+    def __await__(self):
+        return self._run().__await__()
+
+    async def __aenter__(self):
+        self._cursor = await self._run()
+        return self._cursor
+
+    async def __aexit__(self, *exc_info):
+        await self._cursor.close()
+
+class ProfiledConnection:
+    """Wraps the writer connection inside DatabaseManager._write() so statements issued there are recorded"""
+
+    def __init__(self, conn, profiler: QueryProfiler):
+        self._conn = conn
+        self._profiler = profiler
+
+    def execute(self, sql, parameters=()):
+        return _TimedExecute(self._profiler, sql, self._conn.execute(sql, parameters))
+
+    def executemany(self, sql, parameters):
+        return _TimedExecute(self._profiler, sql, self._conn.executemany(sql, parameters))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
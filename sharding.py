@@ -0,0 +1,63 @@
+# sharding.py
+import asyncio
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+def shard_for(guild_id: int, shard_count: int) -> int:
+    """The shard Discord routes this guild's events to"""
+    return (guild_id >> 22) % shard_count
+
+def owns_guild(bot, guild_id: int) -> bool:
+    """Whether this process serves the guild; per-guild state is only loaded where it is owned"""
+    shard_ids = getattr(bot, "shard_ids", None)
+    shard_count = getattr(bot, "shard_count", None)
+    if not shard_ids or not shard_count:
+        return True
+    return shard_for(guild_id, shard_count) in shard_ids
+
+class ShardHealth:
+    """Per-shard gateway state, fed by the on_shard_* events"""
+
+    def __init__(self, shard_ids=()):
+        self._shards = {shard_id: ("connecting", time.time()) for shard_id in shard_ids}
+
+    def mark(self, shard_id: int, state: str):
+        self._shards[shard_id] = (state, time.time())
+
+    def all_ready(self) -> bool:
+        return bool(self._shards) and all(state == "ready" for state, _ in self._shards.values())
+
+    def snapshot(self, bot) -> dict:
+        shards = {}
+        for shard_id, (state, since) in sorted(self._shards.items()):
+            info = bot.get_shard(shard_id)
+            latency = info.latency if info is not None else None
+            shards[shard_id] = {
+                "state": state,
+                "since": since,
+                "latency_seconds": latency if latency is not None and math.isfinite(latency) else None,
+                "guilds": sum(1 for guild in bot.guilds if guild.shard_id == shard_id),
+            }
+        return shards
+
+class StubGateway:
+    """Stands in for the Discord gateway so a bot or cluster can run locally without a token.
+
+    Runs setup_hook as login() would, then reports every shard connected and ready and
+    stays up until cancelled. Nothing is received from Discord.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def run(self):
+        await self.bot.setup_hook()
+        for shard_id in self.bot.shard_ids or range(self.bot.shard_count or 1):
+            self.bot.dispatch("shard_connect", shard_id)
+            await asyncio.sleep(0)
+            self.bot.dispatch("shard_ready", shard_id)
+        logger.info("🧪 Stub gateway up; no Discord connection is made")
+        await asyncio.Event().wait()
@@ -0,0 +1,7 @@
+# tests/conftest.py
+import os
+import sys
+
+# config.py refuses to import without a token; tests never connect to Discord
+os.environ.setdefault("DISCORD_BOT_TOKEN", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
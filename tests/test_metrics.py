@@ -0,0 +1,20 @@
+# tests/test_metrics.py
+import asyncio
+from types import SimpleNamespace
+from multidict import CIMultiDict
+import timing
+from metrics import HTTP_RATE_LIMITS
+
+def _request_end(status, **headers):
+    ctx = SimpleNamespace()
+    asyncio.run(timing._on_request_start(None, ctx, None))
+    response = SimpleNamespace(status=status, headers=CIMultiDict(headers))
+    asyncio.run(timing._on_request_end(None, ctx, SimpleNamespace(response=response)))
+
+def test_429s_counted_once_by_scope():
+    before = dict(HTTP_RATE_LIMITS._values)
+    _request_end(429, **{"X-RateLimit-Global": "true", "X-RateLimit-Scope": "global"})
+    _request_end(429, **{"X-RateLimit-Scope": "user", "X-RateLimit-Bucket": "abc"})
+    _request_end(200, **{"X-RateLimit-Remaining": "0"})
+    counts = {labels: value - before.get(labels, 0) for labels, value in HTTP_RATE_LIMITS._values.items()}
+    assert {labels: value for labels, value in counts.items() if value} == {("global",): 1, ("route",): 1}
@@ -0,0 +1,16 @@
+# tests/test_query_plans.py
+import asyncio
+import pytest
+from benchmarks.check_query_plans import collect_plans, full_scans
+
+@pytest.fixture(scope="module")
+def plans():
+    return asyncio.run(collect_plans())
+
+def test_hot_queries_do_not_scan(plans):
+    failures = full_scans(plans)
+    assert not failures, "\n".join(f"{method}: {'; '.join(scans)}\n    {sql}" for method, sql, scans in failures)
+
+def test_helper_tickets_start_from_helper(plans):
+    [plan] = [plan for _, method, _, plan in plans if method == "get_helper_tickets"]
+    assert plan[0].startswith("SEARCH h USING COVERING INDEX idx_ticket_helpers_user_channel"), plan
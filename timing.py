@@ -0,0 +1,125 @@
+# timing.py
+import contextvars
+import functools
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Interactions must be answered within 3 s; warn once a handler gets this close
+SLOW_COMMAND_SECONDS = 2.0
+# Most recent samples kept per command for percentiles
+SAMPLE_SIZE = 1024
+
+class Timing:
+    """Time spent by one command, split by where it went; shared by everything awaited inside it"""
+    __slots__ = ("name", "db", "rest", "db_depth")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.db = 0.0
+        self.rest = 0.0
+        self.db_depth = 0
+
+_current = contextvars.ContextVar("command_timing", default=None)
+# command name -> deque of (wall, db, rest, local) in seconds
+_samples = {}
+
+def current():
+    return _current.get()
+
+@contextmanager
+def track(name: str = None):
+    """Time the block as one command; DB and REST time inside it are attributed through the context"""
+    timing = Timing(name)
+    token = _current.set(timing)
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        _current.reset(token)
+        record(timing, time.perf_counter() - start)
+
+def record(timing: Timing, wall: float):
+    # Whatever is not DB or REST: our own code plus time waiting for the event loop
+    local = max(wall - timing.db - timing.rest, 0.0)
+    samples = _samples.get(timing.name)
+    if samples is None:
+        samples = _samples[timing.name] = deque(maxlen=SAMPLE_SIZE)
+    samples.append((wall, timing.db, timing.rest, local))
+    if wall >= SLOW_COMMAND_SECONDS:
+        logger.warning(
+            f"🐢 Slow command {timing.name}: wall={wall:.3f}s db={timing.db:.3f}s rest={timing.rest:.3f}s local={local:.3f}s",
+            extra={"command": timing.name, "wall": wall, "db": timing.db, "rest": timing.rest, "local": local},
+        )
+
+def timed(name: str):
+    """Decorator for view, select and modal callbacks"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with track(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@contextmanager
+def db_call():
+    """Attribute the block to DB time; nested DatabaseManager calls count once"""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    timing.db_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.db_depth -= 1
+        if timing.db_depth == 0:
+            timing.db += time.perf_counter() - start
+
+async def _on_request_start(session, ctx, params):
+    ctx.start = time.perf_counter()
+
+async def _on_request_end(session, ctx, params):
+    await _on_request_exception(session, ctx, params)
+    if params.response.status == 429:
+        # Imported here: metrics imports this module
+        from metrics import count_rate_limit
+        count_rate_limit(params.response.headers)
+
+async def _on_request_exception(session, ctx, params):
+    timing = _current.get()
+    if timing is not None:
+        timing.rest += time.perf_counter() - ctx.start
+
+def http_trace():
+    """TraceConfig for the bot's `http_trace` option; adds every Discord REST round trip to the current command and counts 429s"""
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_on_request_start)
+    trace.on_request_end.append(_on_request_end)
+    trace.on_request_exception.append(_on_request_exception)
+    return trace
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+def percentiles(name: str = None, quantiles=(50, 95, 99)):
+    """Return {command: {"count": n, "wall"|"db"|"rest"|"local": {q: seconds}}} over the recent samples"""
+    names = [name] if name is not None else sorted(_samples, key=str)
+    result = {}
+    for command in names:
+        samples = list(_samples.get(command, ()))
+        if not samples:
+            continue
+        stats = {"count": len(samples)}
+        for i, part in enumerate(("wall", "db", "rest", "local")):
+            column = [sample[i] for sample in samples]
+            stats[part] = {q: _percentile(column, q) for q in quantiles}
+        result[command] = stats
+    return result
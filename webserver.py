@@ -1,19 +1,81 @@
 # webserver.py
-from flask import Flask
-import threading
+import asyncio
+import logging
+import math
 import os
+from aiohttp import web
+from metrics import REGISTRY
 
-app = Flask(__name__)
+logger = logging.getLogger(__name__)
 
-@app.route("/")
-def home():
-    return "Bot is running!"
+# /readyz fails above this heartbeat latency (seconds)
+MAX_LATENCY = float(os.environ.get("READY_MAX_LATENCY", 10))
+DB_PING_TIMEOUT = 2.0
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
 
-def start_webserver():
-    def run():
-        port = int(os.environ.get("PORT", 5000))
-        app.run(host="0.0.0.0", port=port)
-    
-    thread = threading.Thread(target=run)
-    thread.daemon = True
-    thread.start()
+def gateway_connected(bot) -> bool:
+    return not bot.is_closed() and bot.shard_health.all_ready()
+
+class WebServer:
+    """HTTP probes and /metrics, served on the bot's own event loop"""
+
+    def __init__(self, bot, host: str = "0.0.0.0", port: int = None):
+        self.bot = bot
+        self.host = host
+        self.port = port if port is not None else int(os.environ.get("PORT", 5000))
+        self._runner = None
+        self.app = web.Application()
+        self.app.add_routes([
+            web.get("/", self.home),
+            web.get("/healthz", self.healthz),
+            web.get("/readyz", self.readyz),
+            web.get("/shards", self.shards),
+            web.get("/metrics", self.metrics),
+        ])
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"✅ Webserver listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def db_ok(self) -> bool:
+        try:
+            await asyncio.wait_for(self.bot.db.ping(), DB_PING_TIMEOUT)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Database ping failed: {e!r}")
+            return False
+
+    async def home(self, request):
+        return web.Response(text="Bot is running!")
+
+    async def healthz(self, request):
+        """Liveness: the event loop answers and the database responds; gateway reconnects do not count"""
+        checks = {"database": await self.db_ok()}
+        return web.json_response(checks, status=200 if all(checks.values()) else 503)
+
+    async def readyz(self, request):
+        """Readiness: every shard connected with a sane heartbeat, and the database responds"""
+        latencies = [latency for _, latency in self.bot.latencies if math.isfinite(latency)]
+        latency = max(latencies, default=None)
+        checks = {
+            "gateway": gateway_connected(self.bot),
+            "latency": latency is None or latency <= MAX_LATENCY,
+            "database": await self.db_ok(),
+        }
+        body = dict(checks, latency_seconds=latency)
+        return web.json_response(body, status=200 if all(checks.values()) else 503)
+
+    async def shards(self, request):
+        """Per-shard gateway state for this process; 503 unless every shard is ready"""
+        body = {"shard_count": self.bot.shard_count, "shards": self.bot.shard_health.snapshot(self.bot)}
+        return web.json_response(body, status=200 if gateway_connected(self.bot) else 503)
+
+    async def metrics(self, request):
+        return web.Response(body=REGISTRY.render().encode("utf-8"), headers={"Content-Type": METRICS_CONTENT_TYPE})